@@ -1,6 +1,6 @@
 {
     'name': 'HR Job Tags',
-    'version': '17.0.1.0.0',
+    'version': '17.0.1.1.0',
     'category': 'Human Resources',
     'summary': 'Add tags to Job Positions',
     'description': """
@@ -1,14 +1,83 @@
-from odoo import models, fields
+import logging
+
+from odoo import api, models, fields, _
+from odoo.exceptions import ValidationError
+from odoo.tools import escape_psql, sql
+
+_logger = logging.getLogger(__name__)
 
 class HrJobTag(models.Model):
     _name = 'hr.job.tag'
     _description = 'Job Position Tags'
     _order = 'name'
 
-    name = fields.Char(string='Tag Name', required=True, translate=True)
+    # Tags are short admin-defined labels: not translated, so they are
+    # stored as a plain varchar instead of a jsonb of translations.
+    name = fields.Char(string='Tag Name', required=True)
     color = fields.Integer(string='Color Index')
-    job_ids = fields.Many2many('hr.job', string='Job Positions')
+    job_ids = fields.Many2many(
+        'hr.job',
+        'hr_job_hr_job_tag_rel',
+        'hr_job_tag_id',
+        'hr_job_id',
+        string='Job Positions'
+    )
 
     _sql_constraints = [
         ('name_uniq', 'unique (name)', 'Tag name already exists!')
-    ]
\ No newline at end of file
+    ]
+
+    def _auto_init(self):
+        # `name` used to be a translated (jsonb) column: drop the index on
+        # its en_US value before the column is converted back to varchar.
+        # init() then recreates it on lower(name).
+        columns = sql.table_columns(self.env.cr, self._table)
+        if columns.get('name', {}).get('udt_name') == 'jsonb':
+            sql.drop_index(self.env.cr, 'hr_job_tag_name_lower_uniq', self._table)
+        return super()._auto_init()
+
+    @api.constrains('name')
+    def _check_name_case_insensitive(self):
+        # Checked before the lower(name) index, which would only raise a
+        # raw IntegrityError
+        for tag in self:
+            if self.search_count([('id', '!=', tag.id), ('name', '=ilike', escape_psql(tag.name))], limit=1):
+                raise ValidationError(_("A tag named '%s' already exists.", tag.name))
+
+    def init(self):
+        # Case-insensitive uniqueness of tag names
+        if not sql.index_exists(self.env.cr, 'hr_job_tag_name_lower_uniq'):
+            self._merge_case_duplicates()
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS hr_job_tag_name_lower_uniq
+            ON hr_job_tag (lower(name))
+        """)
+
+    def _merge_case_duplicates(self):
+        """
+        Merges the tags whose names only differ by case into the oldest
+        one, so the unique index on lower(name) can be created: their
+        jobs are moved to the kept tag, then they are deleted.
+        """
+        cr = self.env.cr
+        cr.execute("""
+            SELECT array_agg(id ORDER BY id)
+            FROM hr_job_tag
+            GROUP BY lower(name)
+            HAVING count(*) > 1
+        """)
+        for (ids,) in cr.fetchall():
+            keep_id, duplicate_ids = ids[0], tuple(ids[1:])
+            cr.execute("""
+                INSERT INTO hr_job_hr_job_tag_rel (hr_job_id, hr_job_tag_id)
+                SELECT hr_job_id, %s
+                FROM hr_job_hr_job_tag_rel
+                WHERE hr_job_tag_id IN %s
+                ON CONFLICT DO NOTHING
+            """, [keep_id, duplicate_ids])
+            cr.execute("DELETE FROM hr_job_hr_job_tag_rel WHERE hr_job_tag_id IN %s", [duplicate_ids])
+            cr.execute("DELETE FROM hr_job_tag WHERE id IN %s", [duplicate_ids])
+            _logger.warning(
+                "Merged the job tags %s into tag %s: their names only differ by case",
+                list(duplicate_ids), keep_id,
+            )
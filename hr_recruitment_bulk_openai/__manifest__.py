@@ -7,8 +7,8 @@
     'description': """
 This module extends the Job Position form (hr.job) to allow a recruiter
 to upload multiple CVs (ir.attachment).
-A new button "Add Candidates" appears, which triggers a background
-job (using with_delay) to process each CV.
+A new button "Add Candidates" appears, which triggers a batch of background
+jobs (using with_delay and queue_job_batch), each processing a chunk of CVs.
 
 It re-uses the OpenAI assistant logic from hr_recruitment_openai to:
 1. Upload each file to OpenAI.
@@ -16,8 +16,13 @@ It re-uses the OpenAI assistant logic from hr_recruitment_openai to:
 3. Parse the JSON response.
 4. Create a new Applicant (hr.applicant) for the current job if no applicant with the same name and email exists.
 5. Attach the original CV to the new applicant.
-6. Send toast notifications to the recruiter on start and completion.
+6. Send toast notifications to the recruiter on start and on batch completion.
 7. Provides a button to clear the uploaded CVs after processing.
+
+For large, non-urgent imports, the "Add Candidates (Batch API)" button sends
+all the CVs as a single OpenAI Batch API job instead (half the price, results
+within 24 hours). A cron checks the batch and creates the applicants once it
+has completed.
     """,
     'author': "alextranduil",
     'website': "https://jito.dev",
@@ -27,10 +32,12 @@ It re-uses the OpenAI assistant logic from hr_recruitment_openai to:
         'hr_recruitment',
         'hr_recruitment_openai',  # Depends on custom hr_recruitment_openai existing addon
         'queue_job',  # ADDED: Dependency for background processing
+        'queue_job_batch',  # Groups the per-chunk jobs of a bulk run
         'bus',          # Dependency for user notifications
     ],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/hr_job_views.xml',
     ],
     'installable': True,
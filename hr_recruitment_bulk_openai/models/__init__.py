@@ -1,3 +1,5 @@
 # -*- coding: utf-8 -*-
 
 from . import hr_job
+from . import queue_job
+from . import queue_job_batch
@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import base64
 import json
 import logging
@@ -7,11 +8,73 @@ import re # Import re, as _parse_openai_response uses it
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from odoo.tools import split_every
+from odoo.addons.queue_job.exception import RetryableJobError
 # Import the prompt from your base module
-from odoo.addons.hr_recruitment_openai.models.hr_applicant import OPENAI_CV_EXTRACTION_PROMPT
+from odoo.addons.hr_recruitment_openai.models.hr_applicant import OPENAI_CV_EXTRACTION_PROMPT, _openai
+from odoo.addons.hr_recruitment_llm_utils.utils.llm_retry import async_call_with_retry, call_with_retry, is_rate_limit_error
 
 _logger = logging.getLogger(__name__)
 
+# Number of CVs handled by a single queue job of the batch.
+CV_CHUNK_SIZE = 20
+# Maximum number of concurrent OpenAI calls within a chunk job, to stay
+# under the OpenAI rate limits.
+MAX_CONCURRENT_CALLS = 5
+# OpenAI Batch API: endpoint of the batched requests, and the statuses of
+# a batch that is still running.
+OPENAI_BATCH_ENDPOINT = '/v1/responses'
+OPENAI_BATCH_PENDING_STATUSES = ('validating', 'in_progress', 'finalizing', 'cancelling')
+
+
+async def _call_openai_concurrently(requests):
+    """
+    Sends the given OpenAI requests concurrently, at most
+    MAX_CONCURRENT_CALLS at a time, so a chunk takes about as long
+    as its slowest CVs instead of the sum of all of them.
+
+    Args:
+        requests (list): (api_key, request) tuples, as returned by
+                         `hr.applicant._openai_prepare_cv_request()`.
+
+    Returns:
+        list: For each request, in order, the response text or the
+        exception raised by the call.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_CALLS)
+    clients = {}
+
+    async def _call(api_key, request):
+        if api_key not in clients:
+            clients[api_key] = _openai().AsyncOpenAI(api_key=api_key)
+        async with semaphore:
+            response = await async_call_with_retry(clients[api_key].responses.create, **request)
+        return response.output_text
+
+    try:
+        return await asyncio.gather(
+            *(_call(api_key, request) for api_key, request in requests),
+            return_exceptions=True,
+        )
+    finally:
+        for client in clients.values():
+            await client.close()
+
+
+def _get_response_output_text(body):
+    """
+    Returns the output text of a Responses API object given as a dict,
+    as found in the output files of the Batch API (the SDK's
+    `output_text` shortcut is not available there).
+    """
+    return ''.join(
+        content.get('text', '')
+        for item in body.get('output', [])
+        if item.get('type') == 'message'
+        for content in item.get('content', [])
+        if content.get('type') == 'output_text'
+    )
+
 
 class HrJob(models.Model):
     _inherit = 'hr.job'
@@ -36,13 +99,34 @@ class HrJob(models.Model):
         copy=False,
         help="Indicates that a bulk processing has been completed."
     )
+    cv_job_batch_id = fields.Many2one(
+        'queue.job.batch',
+        string="CV Processing Batch",
+        copy=False,
+        readonly=True,
+        help="Queue job batch grouping the background jobs of the last bulk processing."
+    )
+    openai_batch_id = fields.Char(
+        string="OpenAI Batch",
+        copy=False,
+        readonly=True,
+        help="ID of the running OpenAI Batch API job of the last bulk processing."
+    )
+    openai_batch_user_id = fields.Many2one(
+        'res.users',
+        string="OpenAI Batch Requested By",
+        copy=False,
+        readonly=True,
+        help="User notified when the OpenAI Batch API job is processed."
+    )
 
     # --- Button Actions ---
 
     def action_process_cvs(self):
         """
         Triggered by the 'Add Candidates' button.
-        Sets flags and launches the background job.
+        Sets flags and launches a batch of background jobs, one per
+        chunk of CVs.
         """
         self.ensure_one()
 
@@ -55,25 +139,24 @@ class HrJob(models.Model):
             # --- END LOCK ---
 
             # --- Perform checks on the FRESH record ---
-            if job.processing_in_progress:
-                raise UserError(_("Processing is already in progress. Please wait until it is complete."))
-            
-            if job.processing_complete:
-                raise UserError(_("Processing has already been completed for these files. Please delete the attached files to start a new batch."))
-
-            if not job.cv_attachment_ids:
-                raise UserError(_("Please attach CV files before processing."))
+            job._check_cv_processing_allowed()
 
             _logger.info("--- Button 'action_process_cvs' TRIGGERED by user %s ---", self.env.user.name)
 
+            # Group all chunk jobs in one batch: a single completion hook
+            # and notification instead of one per CV.
+            batch = self.env['queue.job.batch'].get_new_batch(_("Bulk CVs: %s", job.name))
+
             # Write the flags. This is now safe.
             job.write({
                 'processing_in_progress': True,
-                'processing_complete': False
+                'processing_complete': False,
+                'cv_job_batch_id': batch.id,
             })
 
-            # Pass the user ID to notify the correct user
-            job.with_delay()._process_cvs_thread(self.env.user.id)
+            for chunk_ids in split_every(CV_CHUNK_SIZE, job.cv_attachment_ids.ids):
+                job.with_context(job_batch=batch).with_delay()._process_cv_chunk(list(chunk_ids))
+            batch.enqueue()
 
             # Return a toast notification to the user
             return {
@@ -81,7 +164,10 @@ class HrJob(models.Model):
                 'tag': 'display_notification',
                 'params': {
                     'title': _('Processing Started'),
-                    'message': _('The CV processing has started. You will be notified upon completion.'),
+                    'message': _(
+                        'The processing of %s CVs has started. You will be notified upon completion.',
+                        len(job.cv_attachment_ids)
+                    ),
                     'type': 'info',
                     'sticky': False,
                 }
@@ -92,6 +178,56 @@ class HrJob(models.Model):
             raise
 
 
+    def action_process_cvs_openai_batch(self):
+        """
+        Triggered by the 'Add Candidates (Batch API)' button.
+        Same as `action_process_cvs`, but all the CVs are sent as one
+        OpenAI Batch API job: results come within 24 hours, at half the
+        price. Meant for large imports that are not urgent.
+        """
+        self.ensure_one()
+
+        # --- Database lock to prevent double-clicks ---
+        self.env.cr.execute('SELECT * FROM hr_job WHERE id = %s FOR UPDATE', (self.id,))
+        job = self.browse(self.id)
+        job._check_cv_processing_allowed()
+
+        _logger.info("--- Button 'action_process_cvs_openai_batch' TRIGGERED by user %s ---", self.env.user.name)
+
+        job.write({
+            'processing_in_progress': True,
+            'processing_complete': False,
+            'openai_batch_user_id': self.env.uid,
+        })
+        # Building and uploading the batch file is done in the background
+        job.with_delay()._submit_openai_batch()
+
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Processing Started'),
+                'message': _(
+                    'The %s CVs will be sent to the OpenAI Batch API. Results can take up to 24 hours: you will be notified upon completion.',
+                    len(job.cv_attachment_ids)
+                ),
+                'type': 'info',
+                'sticky': False,
+            }
+        }
+
+    def _check_cv_processing_allowed(self):
+        """Raises a UserError if the CVs of the job cannot be processed now."""
+        self.ensure_one()
+        if self.processing_in_progress:
+            raise UserError(_("Processing is already in progress. Please wait until it is complete."))
+
+        if self.processing_complete:
+            raise UserError(_("Processing has already been completed for these files. Please delete the attached files to start a new batch."))
+
+        if not self.cv_attachment_ids:
+            raise UserError(_("Please attach CV files before processing."))
+
     def action_delete_cv_attachments(self):
         """
         Triggered by the 'Delete Attached Files' button.
@@ -128,102 +264,455 @@ class HrJob(models.Model):
 
     # --- Background Processing ---
 
-    def _process_cvs_thread(self, user_id):
+    def _process_cv_chunk(self, attachment_ids):
         """
-        This method runs in the background via the Odoo job queue.
-        It processes all attached CVs, creates applicants, and notifies the user.
+        This method runs in the background via the Odoo job queue, as
+        one job of the batch launched by `action_process_cvs`.
+        It extracts the data of the given CVs, then creates all the
+        applicants and their CV attachments in batch.
+
+        Args:
+            attachment_ids (list): IDs of the `ir.attachment` CVs of this chunk.
+
+        Returns:
+            str: The JSON counts and errors of the chunk, stored as the
+            job result and aggregated by `_finish_cv_batch`.
         """
         self.ensure_one()
-        
-        user = self.env['res.users'].browse(user_id)
-        partner = user.partner_id
 
-        ApplicantEnv = self.env['hr.applicant']
+        # Skip follower subscription and field tracking for bulk creation
+        ApplicantEnv = self.env['hr.applicant'].with_context(
+            mail_create_nosubscribe=True,
+            tracking_disable=True,
+        )
         AttachmentEnv = self.env['ir.attachment']
-        
-        success_count = 0
+
         fail_count = 0
         errors = []
-        
-        attachments = self.cv_attachment_ids
 
+        # 1. Prepare the OpenAI request of each CV
+        attachments = AttachmentEnv
+        requests = []
+        for att in AttachmentEnv.browse(attachment_ids):
+            if not att.file_size:
+                _logger.warning(f"Skipping CV {att.name}: Attachment data is empty.")
+                continue
+            try:
+                requests.append(ApplicantEnv._openai_prepare_cv_request(att))
+                attachments |= att
+            except Exception as e:
+                _logger.error(f"Failed to process CV {att.name} for job {self.name}: {e}")
+                fail_count += 1
+                errors.append(f"{att.name}: {str(e)}")
+
+        # 2. Call OpenAI for all CVs concurrently and parse the responses (no DB writes)
+        _logger.info(f"Calling OpenAI for {len(requests)} CVs of job {self.name}")
+        responses = asyncio.run(_call_openai_concurrently(requests)) if requests else []
+        parsed_cvs = []
+        for att, response in zip(attachments, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                log_id = f"job_{self.id}_att_{att.id}"
+                data_dict = ApplicantEnv._parse_openai_response(response, record_id=log_id)
+                parsed_cvs.append((att, data_dict))
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    # OpenAI is still rate limiting us after the retries:
+                    # let queue_job retry the whole chunk later.
+                    raise RetryableJobError(
+                        _("OpenAI rate limit reached: %s", str(e)),
+                        seconds=60,
+                    )
+                _logger.error(f"Failed to process CV {att.name} for job {self.name}: {e}")
+                fail_count += 1
+                errors.append(f"{att.name}: {str(e)}")
+
+        return json.dumps(self._create_applicants_from_cvs(parsed_cvs, fail_count, errors))
+
+    def _create_applicants_from_cvs(self, parsed_cvs, fail_count=0, errors=None):
+        """
+        Creates the applicants of this job, and their CV attachments, in
+        batch from the data extracted from the CVs. The candidates who
+        already applied to the job are skipped.
+
+        Args:
+            parsed_cvs (list): (attachment, data_dict) tuples.
+            fail_count (int): Number of CVs which already failed before.
+            errors (list, optional): Error lines of those CVs.
+
+        Returns:
+            dict: The 'created', 'skipped' and 'failed' counts, and the
+            'errors' lines.
+        """
+        self.ensure_one()
+        errors = list(errors or [])
+
+        # Skip follower subscription and field tracking for bulk creation
+        ApplicantEnv = self.env['hr.applicant'].with_context(
+            mail_create_nosubscribe=True,
+            tracking_disable=True,
+        )
+        AttachmentEnv = self.env['ir.attachment']
+
+        # 3. Skip the candidates who already applied to this job
+        parsed_cvs, skipped = self._filter_existing_applicants(parsed_cvs)
+        for att_name in skipped:
+            _logger.info(f"Skipping CV {att_name}: an applicant with the same name and email already exists for job {self.name}")
+
+        # 4. Create all new applicants at once
+        # The degrees are resolved in the savepoint of the create: a failed
+        # create leaves no orphan degree behind.
+        vals_list = [self._prepare_bulk_applicant_vals(att, data_dict) for att, data_dict in parsed_cvs]
         try:
-            for att in attachments:
+            with self.env.cr.savepoint():
+                ApplicantEnv._add_degree_vals(vals_list, [data_dict.get('degree') for _att, data_dict in parsed_cvs])
+                applicants = ApplicantEnv.create(vals_list)
+        except Exception as e:
+            # Fall back to one by one creation to isolate the faulty CV(s)
+            _logger.warning(f"Batch creation of applicants failed for job {self.name}, retrying one by one: {e}")
+            applicants = ApplicantEnv
+            created_cvs = []
+            for (att, data_dict), vals in zip(parsed_cvs, vals_list):
                 try:
                     with self.env.cr.savepoint():
-                        _logger.info(f"Processing CV: {att.name} for job {self.name}")
-                        
-                        if not att.datas:
-                            _logger.warning(f"Skipping CV {att.name}: Attachment data is empty.")
-                            continue
-
-                        # 1. Call OpenAI
-                        response_text = ApplicantEnv._openai_call_for_cv(att)
-                        
-                        # 2. Parse response
-                        log_id = f"job_{self.id}_att_{att.id}"
-                        data_dict = ApplicantEnv._parse_openai_response(response_text, record_id=log_id)
-
-                        # 3. Create new applicant
-                        create_vals = {
-                            'name': data_dict.get('name') or _("%s's Application") % att.name.rsplit('.', 1)[0],
-                            'partner_name': data_dict.get('name'),
-                            'email_from': data_dict.get('email'),
-                            'partner_phone': data_dict.get('phone'),
-                            'job_id': self.id,
-                            'openai_extract_state': 'done',
-                            'openai_extract_status': _('Created from bulk import. Processing data...'),
-                        }
-                        
-                        new_applicant = ApplicantEnv.create(create_vals)
-                        _logger.info(f"Created new applicant: {new_applicant.name} (ID: {new_applicant.id})")
-
-                        # 4. Call processing method ON THE NEW APPLICANT
-                        status_msg = new_applicant._process_extracted_cv_data(data_dict)
-                        new_applicant.write({'openai_extract_status': status_msg})
-
-                        # 5. Attach original CV to the new applicant
-                        AttachmentEnv.create({
-                            'name': att.name,
-                            'datas': att.datas,
-                            'res_model': 'hr.applicant',
-                            'res_id': new_applicant.id,
-                        })
-                        
-                        success_count += 1
-                        _logger.info(f"Successfully processed applicant: {new_applicant.name}")
-
-                except Exception as e:
-                    # This catches errors for *one* CV
-                    _logger.error(f"Failed to process CV {att.name} for job {self.name}: {e}")
+                        # The degrees of the batch attempt were rolled back
+                        ApplicantEnv._add_degree_vals([vals], [data_dict.get('degree')])
+                        applicants |= ApplicantEnv.create(vals)
+                    created_cvs.append((att, data_dict))
+                except Exception as e_create:
+                    _logger.error(f"Failed to create applicant from CV {att.name} for job {self.name}: {e_create}")
                     fail_count += 1
-                    errors.append(f"{att.name}: {str(e)}")
-                
-                # self.env.cr.commit()  <--- THIS IS REMOVED (The fix)
+                    errors.append(f"{att.name}: {str(e_create)}")
+            parsed_cvs = created_cvs
+
+        # 5. Write the extracted data (simple fields and skills) of each applicant
+        attachment_vals_list = []
+        for new_applicant, (att, data_dict) in zip(applicants, parsed_cvs):
+            try:
+                with self.env.cr.savepoint():
+                    # The simple fields are already set by the create() values
+                    status_msg = new_applicant._process_extracted_skills(data_dict)
+                    new_applicant.write({'openai_extract_status': status_msg})
+                _logger.info(f"Successfully processed applicant: {new_applicant.name} (ID: {new_applicant.id})")
+            except Exception as e:
+                _logger.error(f"Failed to write extracted data of CV {att.name} for job {self.name}: {e}")
+                new_applicant.write({
+                    'openai_extract_state': 'error',
+                    'openai_extract_status': _("Error: %s", str(e)),
+                })
+                errors.append(f"{att.name}: {str(e)}")
+
+            attachment_vals_list.append({
+                'name': att.name,
+                'raw': att.raw,
+                'res_model': 'hr.applicant',
+                'res_id': new_applicant.id,
+            })
+
+        # 6. Attach the original CVs to the new applicants
+        AttachmentEnv.create(attachment_vals_list)
+
+        return {
+            'created': len(applicants),
+            'skipped': len(skipped),
+            'failed': fail_count,
+            'errors': errors,
+        }
+
+    def _filter_existing_applicants(self, parsed_cvs):
+        """
+        Filters out the CVs of candidates who already have an applicant
+        for this job, i.e. the same name and email (case-insensitive).
+        All CVs of the chunk are checked with a single query; duplicates
+        within the chunk are filtered out as well.
+
+        Args:
+            parsed_cvs (list): (attachment, data_dict) tuples.
+
+        Returns:
+            (list, list): The (attachment, data_dict) tuples to create
+            applicants for, and the names of the skipped attachments.
+        """
+        self.ensure_one()
+
+        def _candidate_key(data_dict):
+            name, email = data_dict.get('name'), data_dict.get('email')
+            return (name.lower(), email.lower()) if name and email else None
+
+        keys = {_candidate_key(data_dict) for _att, data_dict in parsed_cvs} - {None}
+        existing_keys = set()
+        if keys:
+            self.env['hr.applicant'].flush_model(['partner_name', 'email_from', 'job_id'])
+            self.env.cr.execute("""
+                SELECT lower(partner_name), lower(email_from)
+                  FROM hr_applicant
+                 WHERE job_id = %s
+                   AND (lower(partner_name), lower(email_from)) IN %s
+            """, (self.id, tuple(keys)))
+            existing_keys = set(self.env.cr.fetchall())
+
+        cvs_to_create = []
+        skipped = []
+        for att, data_dict in parsed_cvs:
+            key = _candidate_key(data_dict)
+            if key in existing_keys:
+                skipped.append(att.name)
+                continue
+            if key:
+                existing_keys.add(key)
+            cvs_to_create.append((att, data_dict))
+        return cvs_to_create, skipped
+
+    def _prepare_bulk_applicant_vals(self, attachment, data_dict):
+        """
+        Returns the values to create a new applicant for this job
+        from the data extracted from a CV attachment. All the simple
+        fields are set at creation, so no second write is needed.
+        """
+        self.ensure_one()
+        return {
+            **self.env['hr.applicant']._prepare_extracted_data_vals(data_dict),
+            'name': data_dict.get('name') or _("%s's Application") % attachment.name.rsplit('.', 1)[0],
+            'job_id': self.id,
+            'openai_extract_state': 'done',
+            'openai_extract_status': _('Created from bulk import. Processing data...'),
+        }
+
+    def _finish_cv_batch(self):
+        """
+        Called once all the jobs of the queue job batch of a bulk
+        processing have ended (done, failed or cancelled). Sums up the
+        counts of all the chunks and ends the processing.
+        """
+        for job in self:
+            batch = job.cv_job_batch_id
+            totals = {'created': 0, 'skipped': 0, 'failed': 0, 'errors': []}
+            for queue_job in batch.job_ids:
+                if queue_job.state != 'done':
+                    # The chunk job itself failed or was cancelled: it was
+                    # rolled back, so all the CVs of its chunk failed
+                    attachment_ids = queue_job.args[0] if queue_job.args else []
+                    totals['failed'] += len(attachment_ids)
+                    attachment_names = self.env['ir.attachment'].browse(attachment_ids).exists().mapped('name')
+                    totals['errors'].append("%s: %s" % (
+                        ", ".join(attachment_names),
+                        queue_job.exc_message or _("Job %s", queue_job.state),
+                    ))
+                    continue
+                try:
+                    result = json.loads(queue_job.result or '{}')
+                except ValueError:
+                    continue
+                for key in ('created', 'skipped', 'failed'):
+                    totals[key] += result.get(key, 0)
+                totals['errors'] += result.get('errors', [])
+            job._end_cv_processing(batch.user_id, totals)
+
+    def _end_cv_processing(self, user, totals):
+        """
+        Resets the job flags and sends a single notification, with the
+        counts of the whole processing, to the recruiter who launched it.
+
+        Args:
+            user (res.users): The user to notify.
+            totals (dict): The 'created', 'skipped' and 'failed' counts,
+                           and the 'errors' lines.
+        """
+        self.ensure_one()
+        self.write({
+            'processing_in_progress': False,
+            'processing_complete': True,
+        })
+
+        message = _(
+            "CV processing finished for job '%s': %s applicants created, %s skipped (already applied), %s failed.",
+            self.name, totals['created'], totals['skipped'], totals['failed']
+        )
+        if totals['errors']:
+            message += "\n- " + "\n- ".join(totals['errors'])
+
+        params = {
+            'title': _('Processing Complete'),
+            'message': message,
+            'type': 'warning' if totals['errors'] else 'success',
+            'sticky': True,
+        }
+        self.env['bus.bus']._sendone(user.partner_id, 'simple_notification', params)
+
+    # --- OpenAI Batch API ---
+
+    def _get_openai_batch_config(self):
+        """
+        Returns the (api_key, model_name) the OpenAI batch of the job is
+        submitted and read with: the settings of the company of the job,
+        or of the recruiter who launched it.
+        """
+        self.ensure_one()
+        company = self.company_id or self.openai_batch_user_id.company_id
+        return self.env['hr.applicant']._openai_get_config(company.id)
 
+    def _submit_openai_batch(self):
+        """
+        This method runs in the background via the Odoo job queue.
+        It builds the OpenAI request of every CV of the job and submits
+        them all as a single OpenAI Batch API job, whose completion is
+        then checked by `_cron_check_openai_batches`.
+
+        Returns:
+            str: A summary, stored as the job result.
+        """
+        self.ensure_one()
+        ApplicantEnv = self.env['hr.applicant']
+
+        errors = []
+        lines = []
+        for att in self.cv_attachment_ids:
+            if not att.file_size:
+                _logger.warning(f"Skipping CV {att.name}: Attachment data is empty.")
+                continue
+            try:
+                _api_key, request = ApplicantEnv._openai_prepare_cv_request(att)
+            except Exception as e:
+                _logger.error(f"Failed to process CV {att.name} for job {self.name}: {e}")
+                errors.append(f"{att.name}: {str(e)}")
+                continue
+            lines.append(json.dumps({
+                'custom_id': str(att.id),
+                'method': 'POST',
+                'url': OPENAI_BATCH_ENDPOINT,
+                'body': request,
+            }))
+
+        try:
+            if not lines:
+                raise UserError(_("No CV could be prepared for the OpenAI batch."))
+            api_key, _model_name = self._get_openai_batch_config()
+            client = _openai().OpenAI(api_key=api_key)
+            input_file = call_with_retry(
+                client.files.create,
+                file=(f"hr_job_{self.id}_cvs.jsonl", "\n".join(lines).encode()),
+                purpose='batch',
+            )
+            batch = call_with_retry(
+                client.batches.create,
+                input_file_id=input_file.id,
+                endpoint=OPENAI_BATCH_ENDPOINT,
+                completion_window='24h',
+                metadata={'hr_job_id': str(self.id)},
+            )
         except Exception as e:
-            # This catches a critical job-level error
-            _logger.error(f"Critical error during CV processing job {self.name}: {e}", exc_info=True)
-            self.env.cr.rollback() 
-            errors.append(f"Critical Job Failure: {str(e)}")
-
-        finally:
-            # All files processed, update job state
-            self.browse(self.id).write({
-                'processing_in_progress': False,
-                'processing_complete': True
+            if is_rate_limit_error(e):
+                raise RetryableJobError(
+                    _("OpenAI rate limit reached: %s", str(e)),
+                    seconds=60,
+                )
+            _logger.error(f"Failed to submit the OpenAI batch of job {self.name}: {e}")
+            errors.append(str(e))
+            self._end_cv_processing(self.openai_batch_user_id, {
+                'created': 0,
+                'skipped': 0,
+                'failed': len(self.cv_attachment_ids),
+                'errors': errors,
             })
+            return str(e)
 
-            # 6. Send final notification
-            message = _("CV processing finished for job '%s'.\n%s applicants created.\n%s failed.", 
-                        self.name, success_count, fail_count)
-            if errors:
-                message += _("\nErrors:\n- ") + "\n- ".join(errors)
-
-            params = {
-                'title': _('Processing Complete'),
-                'message': message,
-                'type': 'success' if fail_count == 0 else 'warning',
-                'sticky': True,
-            }
-            self.env['bus.bus']._sendone(partner, 'simple_notification', params)
\ No newline at end of file
+        self.openai_batch_id = batch.id
+        _logger.info(f"Submitted OpenAI batch {batch.id} with {len(lines)} CVs for job {self.name}")
+        return _("OpenAI batch %s submitted with %s CVs.", batch.id, len(lines))
+
+    @api.model
+    def _cron_check_openai_batches(self):
+        """
+        Cron job: checks the status of the running OpenAI batches, and
+        launches the creation of the applicants of the completed ones.
+        """
+        for job in self.search([('openai_batch_id', '!=', False)]):
+            try:
+                api_key, _model_name = job._get_openai_batch_config()
+                batch = _openai().OpenAI(api_key=api_key).batches.retrieve(job.openai_batch_id)
+            except Exception as e:
+                _logger.warning(f"Could not check OpenAI batch {job.openai_batch_id} of job {job.name}: {e}")
+                continue
+            if batch.status in OPENAI_BATCH_PENDING_STATUSES:
+                continue
+
+            job.openai_batch_id = False
+            if batch.status == 'completed':
+                job.with_delay()._process_openai_batch_output(batch.output_file_id, batch.error_file_id)
+            else:
+                # failed, expired or cancelled
+                job._end_cv_processing(job.openai_batch_user_id, {
+                    'created': 0,
+                    'skipped': 0,
+                    'failed': len(job.cv_attachment_ids),
+                    'errors': [_("OpenAI batch %s ended with status '%s'.", batch.id, batch.status)],
+                })
+
+    def _process_openai_batch_output(self, output_file_id, error_file_id=None):
+        """
+        This method runs in the background via the Odoo job queue.
+        It reads the results of a completed OpenAI batch and creates the
+        applicants of the job from them.
+
+        Args:
+            output_file_id (str): OpenAI file with the successful requests.
+            error_file_id (str, optional): OpenAI file with the failed requests.
+
+        Returns:
+            str: The JSON counts and errors, stored as the job result.
+        """
+        self.ensure_one()
+        user = self.openai_batch_user_id
+        ApplicantEnv = self.env['hr.applicant']
+
+        # 1. Download the results, keyed by attachment ID
+        results = {}
+        try:
+            api_key, _model_name = self._get_openai_batch_config()
+            client = _openai().OpenAI(api_key=api_key)
+            for file_id in filter(None, [output_file_id, error_file_id]):
+                content = call_with_retry(client.files.content, file_id).text
+                for line in content.splitlines():
+                    if line.strip():
+                        item = json.loads(line)
+                        results[item['custom_id']] = item
+        except Exception as e:
+            if is_rate_limit_error(e):
+                raise RetryableJobError(
+                    _("OpenAI rate limit reached: %s", str(e)),
+                    seconds=60,
+                )
+            _logger.error(f"Failed to read the OpenAI batch output of job {self.name}: {e}")
+            self._end_cv_processing(user, {
+                'created': 0,
+                'skipped': 0,
+                'failed': len(self.cv_attachment_ids),
+                'errors': [str(e)],
+            })
+            return str(e)
+
+        # 2. Parse the response of each CV
+        parsed_cvs = []
+        errors = []
+        for att in self.cv_attachment_ids:
+            item = results.get(str(att.id))
+            try:
+                if not item:
+                    raise UserError(_("No result returned by the OpenAI batch."))
+                response = item.get('response') or {}
+                if item.get('error') or response.get('status_code') != 200:
+                    raise UserError(_("OpenAI error: %s", item.get('error') or response.get('body')))
+                data_dict = ApplicantEnv._parse_openai_response(
+                    _get_response_output_text(response.get('body') or {}),
+                    record_id=f"job_{self.id}_att_{att.id}",
+                )
+                parsed_cvs.append((att, data_dict))
+            except Exception as e:
+                _logger.error(f"Failed to process CV {att.name} for job {self.name}: {e}")
+                errors.append(f"{att.name}: {str(e)}")
+
+        # 3. Create the applicants as the recruiter, like the chunk jobs
+        totals = self.with_user(user)._create_applicants_from_cvs(parsed_cvs, len(errors), errors)
+        self._end_cv_processing(user, totals)
+        return json.dumps(totals)
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+
+class QueueJob(models.Model):
+    _inherit = 'queue.job'
+
+    def write(self, vals):
+        """
+        queue_job_batch only checks the state of a batch when one of its
+        jobs is done: check it as well when a job fails or is cancelled,
+        so a batch whose last job failed still ends.
+        """
+        res = super().write(vals)
+        if vals.get('state') in ('failed', 'cancelled'):
+            self.job_batch_id.check_state()
+        return res
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+# States in which a queue job will not run again by itself. A chunk job
+# ends `failed` once its retries are exhausted: the bulk processing has
+# to be finalized all the same, or the job position stays locked.
+TERMINAL_JOB_STATES = ('done', 'failed', 'cancelled')
+
+
+class QueueJobBatch(models.Model):
+    _inherit = 'queue.job.batch'
+
+    def check_state(self):
+        """
+        Extends the batch state check to finalize the bulk CV processing
+        of the job positions whose batch just ended, i.e. whose jobs are
+        all done, failed or cancelled.
+        """
+        res = super().check_state()
+        ended_batches = self.filtered(
+            lambda b: all(job.state in TERMINAL_JOB_STATES for job in b.job_ids)
+        )
+        if ended_batches:
+            jobs = self.env['hr.job'].search([
+                ('cv_job_batch_id', 'in', ended_batches.ids),
+                ('processing_in_progress', '=', True),
+            ])
+            jobs._finish_cv_batch()
+        return res
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+import base64
+import json
+from unittest.mock import patch
+
+from odoo.tests.common import TransactionCase
+
+from odoo.addons.hr_recruitment_bulk_openai.models import hr_job as hr_job_module
+
+
+class TestHrJobCvBatch(TransactionCase):
+    """
+    Test suite for the end of the bulk CV processing of a job position:
+    the queue job batch of its chunk jobs must finalize the processing
+    once every chunk job has ended, whether it is done or failed.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.job = cls.env['hr.job'].create({'name': 'Test Bulk Import Job'})
+        cls.attachments = cls.env['ir.attachment'].create([{
+            'name': name,
+            'datas': base64.b64encode(b'PDF content'),
+            'mimetype': 'application/pdf',
+        } for name in ('jane_cv.pdf', 'mike_cv.pdf')])
+        cls.job.cv_attachment_ids = [(6, 0, cls.attachments.ids)]
+
+    def setUp(self):
+        super().setUp()
+        # One chunk job per CV
+        with patch.object(hr_job_module, 'CV_CHUNK_SIZE', 1):
+            self.job.action_process_cvs()
+        self.chunk_jobs = self.job.cv_job_batch_id.job_ids.sorted('id')
+        self.sendone_patcher = patch.object(type(self.env['bus.bus']), '_sendone')
+        self.mock_sendone = self.sendone_patcher.start()
+        self.addCleanup(self.sendone_patcher.stop)
+
+    def test_01_failed_chunk_ends_processing(self):
+        """
+        Test that a failed chunk job (e.g. its retries are exhausted)
+        does not leave the job position processing forever.
+        """
+        self.assertEqual(len(self.chunk_jobs), 2)
+        done_job, failed_job = self.chunk_jobs
+
+        done_job.write({
+            'state': 'done',
+            'result': json.dumps({'created': 1, 'skipped': 0, 'failed': 0, 'errors': []}),
+        })
+        self.assertTrue(self.job.processing_in_progress, "One chunk job is still running")
+        self.mock_sendone.assert_not_called()
+
+        failed_job.write({'state': 'failed', 'exc_message': 'OpenAI rate limit reached'})
+        self.assertFalse(self.job.processing_in_progress)
+        self.assertTrue(self.job.processing_complete)
+        self.mock_sendone.assert_called_once()
+
+        # The CV of the failed chunk is counted as failed
+        params = self.mock_sendone.call_args.args[2]
+        self.assertEqual(params['type'], 'warning')
+        self.assertIn("1 applicants created, 0 skipped (already applied), 1 failed", params['message'])
+        failed_cv = self.attachments.browse(failed_job.args[0])
+        self.assertIn("%s: OpenAI rate limit reached" % failed_cv.name, params['message'])
@@ -1,5 +1,4 @@
 # -*- coding: utf-8 -*-
-import base64
 import google.generativeai as genai
 import json
 import logging
@@ -197,11 +196,12 @@ class HrApplicant(models.Model):
                     response_text,
                     record_id=f"applicant_{applicant.id}"
                 )
-                _logger.info(
-                    "Parsed Data for Applicant %s: \n%s",
-                    applicant.id,
-                    json.dumps(extracted_data, indent=2)
-                )
+                if _logger.isEnabledFor(logging.INFO):
+                    _logger.info(
+                        "Parsed Data for Applicant %s: \n%s",
+                        applicant.id,
+                        json.dumps(extracted_data, indent=2)
+                    )
 
                 # 4. Write all data (Reusable INSTANCE method)
                 skill_status_message = applicant._process_extracted_cv_data(extracted_data)
@@ -294,16 +294,18 @@ class HrApplicant(models.Model):
         # 2. Validate attachment
         if not attachment:
             raise UserError(_("No attachment provided."))
-        if not attachment.datas:
+        # Checked on the size, to not load the file content yet
+        if not attachment.file_size:
             raise UserError(_("Attached CV is empty: %s", attachment.name))
 
         _logger.info("Starting Gemini call for attachment: %s", attachment.name)
 
         # 3. Prepare data for API
-        # Decode base64 data from Odoo to raw bytes for the API
+        # `raw` reads the bytes from the filestore (or the database) without
+        # the base64 round trip of `datas`.
         cv_blob = {
             'mime_type': attachment.mimetype,
-            'data': base64.b64decode(attachment.datas)
+            'data': attachment.raw,
         }
 
         # 4. Configure and call the Gemini API
@@ -489,11 +491,12 @@ class HrApplicant(models.Model):
                     write_vals['type_id'] = degree_rec.id
 
         if write_vals:
-            _logger.info(
-                "Writing data for Applicant %s: \n%s",
-                self.id,
-                json.dumps(write_vals, indent=2)
-            )
+            if _logger.isEnabledFor(logging.INFO):
+                _logger.info(
+                    "Writing data for Applicant %s: \n%s",
+                    self.id,
+                    json.dumps(write_vals, indent=2)
+                )
             self.write(write_vals)
         else:
             _logger.info("No new simple data to write for applicant %s.", self.id)
@@ -237,7 +237,7 @@ class TestHrApplicantGemini(TransactionCase):
             # Check prompt and file blob
             self.assertEqual(call_args[0], GEMINI_CV_EXTRACTION_PROMPT_FILE)
             self.assertEqual(call_args[1]['mime_type'], 'application/pdf')
-            self.assertEqual(call_args[1]['data'], self.attachment_datas)
+            self.assertEqual(call_args[1]['data'], base64.b64decode(self.attachment_datas))
 
 
             # 6. Check applicant state
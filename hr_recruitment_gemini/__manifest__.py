@@ -15,16 +15,18 @@ to extract and populate the applicant's name, email, phone, skills, and degree.
         'hr_recruitment', 
         'mail',
         'hr_recruitment_skills',
+        'hr_recruitment_llm_utils',
     ],
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'views/hr_applicant_views.xml',
         'views/res_config_settings_views.xml',
     ],
     'assets': {},
     'external_dependencies': {
         'python': [
-            'google.generativeai',
+            'google-genai',
         ],
     },
     'license': 'LGPL-3',
@@ -2,3 +2,4 @@
 from . import res_company
 from . import res_config_settings
 from . import hr_applicant
+from . import gemini_cv_cache
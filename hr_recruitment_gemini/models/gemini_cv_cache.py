@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+import datetime
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import sql
+
+_logger = logging.getLogger(__name__)
+
+# Cached responses older than this are purged by `_gc_old_entries`.
+CV_CACHE_MAX_AGE = datetime.timedelta(days=30)
+
+
+class GeminiCvCache(models.Model):
+    """
+    Responses of the Gemini extraction, keyed by the checksum of the CV,
+    the model and the version of the prompt. The same CV is often
+    uploaded again (same candidate, another job position): its extraction
+    is then reused instead of calling the API again.
+    """
+    _name = 'gemini.cv.cache'
+    _description = 'Gemini CV Extraction Cache'
+
+    cv_hash = fields.Char(
+        string="CV Checksum",
+        required=True,
+        help="Checksum of the CV file content (the attachment checksum)."
+    )
+    model_name = fields.Char(string="Gemini Model", required=True)
+    prompt_hash = fields.Char(
+        string="Prompt Version",
+        required=True,
+        help="Hash of the extraction prompt and response schema the response was made with."
+    )
+    response_text = fields.Text(string="Response", required=True)
+
+    _sql_constraints = [
+        ('cv_hash_model_uniq', 'unique (cv_hash, model_name, prompt_hash)', 'This CV is already cached for this model!')
+    ]
+
+    def _auto_init(self):
+        # The responses cached before the prompt version was part of the
+        # key cannot be told apart: purge them, so the column can be required.
+        if sql.table_exists(self.env.cr, self._table) and not sql.column_exists(self.env.cr, self._table, 'prompt_hash'):
+            self.env.cr.execute("DELETE FROM gemini_cv_cache")
+        return super()._auto_init()
+
+    @api.model
+    def _get_responses(self, model_name, prompt_hash, cv_hashes):
+        """
+        Returns the cached responses of `model_name` to the prompt
+        `prompt_hash` for the CVs with the given checksums, in a single query.
+
+        Returns:
+            dict: {cv_hash: response_text}, for the cached CVs only.
+        """
+        if not cv_hashes:
+            return {}
+        entries = self.sudo().search_read(
+            [('model_name', '=', model_name), ('prompt_hash', '=', prompt_hash), ('cv_hash', 'in', list(cv_hashes))],
+            ['cv_hash', 'response_text'],
+        )
+        return {entry['cv_hash']: entry['response_text'] for entry in entries}
+
+    @api.model
+    def _store_response(self, cv_hash, model_name, prompt_hash, response_text):
+        """
+        Caches the response of `model_name` to the prompt `prompt_hash`
+        for a CV. A re-run of the extraction replaces the response it
+        redid, and restarts its CV_CACHE_MAX_AGE (INSERT ... ON CONFLICT
+        DO UPDATE): concurrent extractions of the same CV keep the last one.
+        """
+        self.env.cr.execute("""
+            INSERT INTO gemini_cv_cache (cv_hash, model_name, prompt_hash, response_text,
+                                         create_uid, create_date, write_uid, write_date)
+            VALUES (%(cv_hash)s, %(model_name)s, %(prompt_hash)s, %(response_text)s,
+                    %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC')
+            ON CONFLICT (cv_hash, model_name, prompt_hash) DO UPDATE
+               SET response_text = EXCLUDED.response_text,
+                   create_date = EXCLUDED.create_date,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, {
+            'cv_hash': cv_hash,
+            'model_name': model_name,
+            'prompt_hash': prompt_hash,
+            'response_text': response_text,
+            'uid': self.env.uid,
+        })
+
+    @api.model
+    def _gc_old_entries(self):
+        """Cron job: purges the responses cached more than CV_CACHE_MAX_AGE ago."""
+        limit_date = fields.Datetime.now() - CV_CACHE_MAX_AGE
+        old_entries = self.sudo().search([('create_date', '<', limit_date)])
+        _logger.info("Purging %s cached Gemini CV extractions", len(old_entries))
+        old_entries.unlink()
@@ -1,17 +1,144 @@
 # -*- coding: utf-8 -*-
-import base64
-import google.generativeai as genai
+import asyncio
+import datetime
+import hashlib
+import io
 import json
 import logging
 import odoo
+import os
 import re
 import threading
 
-from odoo import api, fields, models, _
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError
+from odoo.osv import expression
+
+from odoo.addons.hr_recruitment_llm_utils.utils.llm_retry import async_call_with_retry, call_with_retry
+from odoo.addons.hr_recruitment_llm_utils.utils.pdf_compress import compress_pdf
+
+try:
+    # Optional: a faster JSON parser for the model responses
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    # Optional: repairs truncated or malformed JSON in the model responses
+    import json_repair
+except ImportError:
+    json_repair = None
 
 _logger = logging.getLogger(__name__)
 
+# The Gemini SDK is heavy to import (tens of MB per worker): it is only
+# imported the first time a CV is scanned, see _genai().
+_GENAI_CACHE = {}
+# Gemini clients of the synchronous calls (batch jobs), keyed by API key:
+# their HTTP connections are reused instead of being set up for each call.
+# The concurrent extraction does not use them: the connections of a
+# client's async transport are bound to the event loop that opened them,
+# so each event loop creates (and closes) its own clients.
+_GEMINI_CLIENTS = {}
+_GEMINI_CLIENTS_LOCK = threading.Lock()
+# Explicit context caches holding the extraction prompt, keyed by
+# (api_key, model_name). A value of False means caching is not available
+# for that model (e.g. the prompt is below its minimum cacheable size).
+_PROMPT_CACHES = {}
+# Serializes the cache lookups/creations of the extraction threads.
+_PROMPT_CACHES_LOCK = threading.Lock()
+PROMPT_CACHE_TTL = datetime.timedelta(hours=1)
+# Renew a cache when it expires in less than this.
+PROMPT_CACHE_REFRESH_MARGIN = datetime.timedelta(minutes=5)
+# When a cache creation failed for another reason than the model (e.g. a
+# timeout or a quota), the prompt is sent inline until this delay passed.
+PROMPT_CACHE_RETRY_DELAY = datetime.timedelta(minutes=1)
+_PROMPT_CACHE_RETRY_AT = {}
+# Gemini rejects requests with more than 20 MB of inline data.
+# Larger CVs are sent through the File API instead.
+INLINE_DATA_MAX_SIZE = 20 * 1024 * 1024
+# Bounded pool running the background extractions, one selection of
+# applicants per task: at most GEMINI_WORKERS tasks (and DB cursors) at once.
+GEMINI_WORKERS = int(os.environ.get('GEMINI_WORKERS', 4))
+_GEMINI_EXECUTOR = None
+_GEMINI_EXECUTOR_LOCK = threading.Lock()
+# Within a task, the API calls of its applicants run concurrently in an
+# asyncio event loop: at most GEMINI_CONCURRENCY requests in flight.
+GEMINI_CONCURRENCY = int(os.environ.get('GEMINI_CONCURRENCY', 16))
+# The extracted applicants are committed in groups of this size.
+GEMINI_COMMIT_INTERVAL = 20
+# Patterns of the response parsing, compiled once for all the CVs:
+# a ```json fenced block, a bare JSON object, a "Name (Progress%)" level.
+_JSON_FENCE_RE = re.compile(r"```json\n(.*?)\n```", re.DOTALL)
+_JSON_OBJ_RE = re.compile(r"\{.*\}", re.DOTALL)
+_LEVEL_RE = re.compile(r"(.+?)\s*\((\d+)%\)")
+# Context of the background extractions: they only read a few fields of
+# each applicant, and their state changes are not worth chatter tracking.
+GEMINI_BACKGROUND_CONTEXT = {
+    'prefetch_fields': False,
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+    'mail_notrack': True,
+}
+# Final states of a Gemini batch job: any other state means it is running.
+GEMINI_BATCH_DONE_STATES = (
+    'JOB_STATE_SUCCEEDED', 'JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED',
+)
+
+
+def _genai():
+    """Returns the `google.genai` module, imported on first use."""
+    if 'genai' not in _GENAI_CACHE:
+        from google import genai
+        from google.genai import types  # noqa: F401 (genai.types)
+        _GENAI_CACHE['genai'] = genai
+    return _GENAI_CACHE['genai']
+
+
+def _get_gemini_client(api_key):
+    """Returns the shared Gemini client of `api_key`, created on first use."""
+    with _GEMINI_CLIENTS_LOCK:
+        if api_key not in _GEMINI_CLIENTS:
+            _GEMINI_CLIENTS[api_key] = _genai().Client(api_key=api_key)
+        return _GEMINI_CLIENTS[api_key]
+
+
+def _make_gemini_cv_part(client, data, path, mime_type, name):
+    """
+    Returns the content part carrying a CV file, as read by
+    `hr.applicant._get_gemini_cv_file()`. Scanned PDFs are downsampled
+    first (if pikepdf is installed), so the size left decides whether the
+    file is sent inline or uploaded with the File API. Compressing and
+    uploading the file block: this does not use the ORM, so it can run
+    in a worker thread of the event loop.
+    """
+    types = _genai().types
+    if data is not None:
+        data = compress_pdf(data, mime_type)
+    if path or len(data) > INLINE_DATA_MAX_SIZE:
+        _logger.info("CV %s exceeds the inline size limit, uploading it with the File API", name)
+        upload_config = types.UploadFileConfig(mime_type=mime_type, display_name=name)
+        # A filestore file is streamed from its path instead of loaded in memory
+        return client.files.upload(file=path or io.BytesIO(data), config=upload_config)
+    return types.Part.from_bytes(data=data, mime_type=mime_type)
+
+
+def _get_gemini_executor():
+    """Returns the extraction thread pool, created on first use."""
+    global _GEMINI_EXECUTOR
+    with _GEMINI_EXECUTOR_LOCK:
+        if _GEMINI_EXECUTOR is None:
+            _GEMINI_EXECUTOR = ThreadPoolExecutor(
+                max_workers=GEMINI_WORKERS,
+                thread_name_prefix='gemini_extraction',
+            )
+    return _GEMINI_EXECUTOR
+
 # This prompt instructs the Gemini model to act as an HR assistant
 # and extract specific fields from a CV file, returning them in a
 # structured JSON format.
@@ -31,15 +158,8 @@ Extract the following fields from the file:
   - "level": The proficiency level (e.g., "Beginner (15%)", "Elementary (25%)", "Intermediate (50%)", "Advanced (80%)", "Expert (100%)").
 
 RULES:
-1.  Return ONLY a valid JSON object.
-2.  Do not include any text before or after the JSON (e.g., no "Here is the JSON..." or markdown backticks).
-3.  If a value is not found, return `null` for that field, except for the "skills" field. For the "skills" field, return the "Beginner (15%)" level.
-4.  The "skills" field must be a list of objects, like:
-    "skills": [
-      {{ "type": "Programming Languages", "skill": "Python", "level": "Advanced (80%)" }},
-      {{ "type": "Languages", "skill": "English", "level": "C1 (85%)" }}
-    ]
-5. Skill levels for different type:
+1.  If a value is not found, return `null` for that field, except for the "skills" field. For the "skills" field, return the "Beginner (15%)" level.
+2. Skill levels for different type:
   - "Programming Languages": "Beginner (15%)", "Elementary (25%)", "Intermediate (50%)", "Advanced (80%)", "Expert (100%)";
   - "Languages": "C2 (100%)", "C1 (85%)", "B2 (75%)", "B1 (60%)", "A2 (40%)", "A1 (10%)";
   - "IT": "Beginner (15%)", "Elementary (25%)", "Intermediate (50%)", "Advanced (80%)", "Expert (100%)";
@@ -50,6 +170,38 @@ RULES:
 JSON:
 """
 
+# Structure of the JSON returned by the model (OpenAPI schema): the model
+# is then constrained to return it bare, without markdown or other text.
+_NULLABLE_STRING = {'type': 'STRING', 'nullable': True}
+GEMINI_CV_RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        'name': _NULLABLE_STRING,
+        'email': _NULLABLE_STRING,
+        'phone': _NULLABLE_STRING,
+        'linkedin': _NULLABLE_STRING,
+        'degree': _NULLABLE_STRING,
+        'skills': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {
+                    'type': {'type': 'STRING'},
+                    'skill': {'type': 'STRING'},
+                    'level': {'type': 'STRING'},
+                },
+                'required': ['type', 'skill', 'level'],
+            },
+        },
+    },
+    'required': ['name', 'email', 'phone', 'linkedin', 'degree', 'skills'],
+}
+# Version of the extraction request, part of the key of the cached CV
+# extractions: a new prompt or schema does not reuse the old responses.
+GEMINI_PROMPT_HASH = hashlib.sha1(
+    (GEMINI_CV_EXTRACTION_PROMPT_FILE + json.dumps(GEMINI_CV_RESPONSE_SCHEMA, sort_keys=True)).encode()
+).hexdigest()
+
 
 class HrApplicant(models.Model):
     """
@@ -91,6 +243,14 @@ class HrApplicant(models.Model):
                 3. The state is 'no_extract', 'error', or 'done' (allowing for retries)."""
     )
 
+    gemini_batch_id = fields.Char(
+        string="Gemini Batch",
+        readonly=True,
+        copy=False,
+        index='btree_not_null',
+        help="Name of the Gemini batch job this applicant's CV was submitted with, until its result is processed."
+    )
+
     linkedin_profile = fields.Char(
         "LinkedIn Profile",
         tracking=True,
@@ -98,6 +258,13 @@ class HrApplicant(models.Model):
         help="Stores the LinkedIn profile URL extracted from the CV."
     )
 
+    def init(self):
+        # Index matching _order: the applicant lists are sorted on it
+        self.env.cr.execute("""
+            CREATE INDEX IF NOT EXISTS hr_applicant_gemini_order_idx
+            ON hr_applicant (gemini_extract_state DESC, priority DESC, id DESC)
+        """)
+
     @api.depends(
         'message_main_attachment_id',
         'gemini_extract_state',
@@ -123,36 +290,233 @@ class HrApplicant(models.Model):
         """
         Action triggered by the 'Extract with Gemini' button.
         It sets the state to 'pending', commits the change, and
-        launches the extraction process in a new background thread
-        to avoid blocking the UI.
+        queues the extraction of the applicants in the background
+        thread pool to avoid blocking the UI.
         """
         applicants_to_process = self.filtered(lambda a: a.can_extract_with_gemini)
         if not applicants_to_process:
             raise UserError(_("There are no applicants here that are ready for extraction."))
 
+        # Re-runs (of done or failed extractions) call the API again:
+        # the cached extraction of their CV is the one being redone.
+        retried = applicants_to_process.filtered(lambda a: a.gemini_extract_state != 'no_extract')
+
         # Set state to 'pending' for instant user feedback.
         applicants_to_process.write({
             'gemini_extract_state': 'pending',
             'gemini_extract_status': _('Pending: Queued for extraction...'),
         })
 
-        # We must commit this state change *before* the new thread starts
-        # to ensure the thread sees the updated state and to prevent
+        # We must commit this state change *before* the worker threads start
+        # to ensure they see the updated state and to prevent
         # serialization failures. This is a rare but necessary use of commit in an action.
         self.env.cr.commit()
 
-        # Start the extraction in a separate thread to avoid UI blocking.
-        thread = threading.Thread(
-            target=self._run_gemini_extraction_in_thread,
-            args=(applicants_to_process.ids, self.env.cr.dbname)
+        # Queue one task for the selected applicants: the pool bounds the
+        # number of concurrent tasks, and of DB connections, whatever the
+        # number of clicks. Each task calls the API for its applicants
+        # concurrently (see _gemini_extract_cv_texts).
+        _get_gemini_executor().submit(
+            self.with_context(gemini_refresh_cv_cache_ids=retried.ids)._run_gemini_extraction_in_thread,
+            applicants_to_process.ids,
+            self.env.cr.dbname,
         )
-        thread.start()
 
         return True  # Acknowledge the button click
 
+    def action_extract_with_gemini_batch(self):
+        """
+        Action to extract many applicants with Gemini Batch Mode: the
+        CVs are submitted as one batch job per company (half the price,
+        results within 24 hours), instead of one synchronous call each.
+        Building and uploading the batches is done in the background
+        thread pool; the results are then processed by
+        `_cron_check_gemini_batches`.
+        """
+        applicants_to_process = self.filtered(lambda a: a.can_extract_with_gemini)
+        if not applicants_to_process:
+            raise UserError(_("There are no applicants here that are ready for extraction."))
+
+        applicants_to_process.write({
+            'gemini_extract_state': 'pending',
+            'gemini_extract_status': _('Pending: Queued for submission to a Gemini batch...'),
+        })
+        # Committed before the submission task starts, like the
+        # synchronous extraction
+        self.env.cr.commit()
+
+        _get_gemini_executor().submit(
+            self._submit_gemini_batches_in_thread, applicants_to_process.ids, self.env.cr.dbname)
+        return True
+
+    def _submit_gemini_batches_in_thread(self, applicant_ids, dbname):
+        """
+        Task run by the background thread pool: submits the applicants
+        as one Gemini batch job per company. Each submitted batch is
+        committed with its applicants right away, so a later failing
+        company does not roll back (and lose track of) the batches
+        already submitted and billed.
+        """
+        try:
+            with odoo.registry(dbname).cursor() as new_cr:
+                env = api.Environment(new_cr, self.env.uid, dict(self.env.context, **GEMINI_BACKGROUND_CONTEXT))
+                env[self._name].browse(applicant_ids)._submit_gemini_batches()
+        except Exception as e:
+            _logger.error("Gemini batch submission thread failed: %s", str(e), exc_info=True)
+
+    def _submit_gemini_batches(self):
+        """
+        Submits `self` as one Gemini batch job per company, committing
+        after each company (see `_submit_gemini_batches_in_thread`).
+        """
+        for company, applicants in self.grouped(lambda a: a.company_id or self.env.company).items():
+            # Empty CVs are not sent as empty parts
+            empty_applicants = applicants.filtered(lambda a: not a.message_main_attachment_id.file_size)
+            if empty_applicants:
+                empty_applicants.write({
+                    'gemini_extract_state': 'error',
+                    'gemini_extract_status': _("Error: Attached CV is empty."),
+                })
+                self.env.cr.commit()
+                applicants -= empty_applicants
+            if not applicants:
+                continue
+            try:
+                batch_name = applicants._submit_gemini_batch(company)
+                applicants.write({
+                    'gemini_batch_id': batch_name,
+                    'gemini_extract_status': _('Pending: Submitted to the Gemini batch %s...', batch_name),
+                })
+            except Exception as e:
+                _logger.error("Could not submit the Gemini batch: %s", str(e), exc_info=True)
+                self.env.cr.rollback()
+                applicants.write({
+                    'gemini_extract_state': 'error',
+                    'gemini_extract_status': _("Error: Could not submit the Gemini batch: %s", str(e)),
+                })
+            self.env.cr.commit()
+
+    def _submit_gemini_batch(self, company):
+        """
+        Submits the CVs of `self` as a single Gemini batch job: a JSONL
+        file with one request (prompt + CV) per applicant, keyed by the
+        applicant ID.
+
+        Returns:
+            str: The name of the batch job.
+        """
+        api_key = company.gemini_api_key
+        model_name = company.gemini_model or 'gemini-2.5-flash'
+        if not api_key:
+            raise UserError(_("Gemini API Key is not set in HR Settings."))
+
+        types = _genai().types
+        client = _get_gemini_client(api_key)
+        lines = []
+        for applicant in self:
+            cv_part = self._prepare_gemini_cv_part(client, applicant.message_main_attachment_id)
+            if not isinstance(cv_part, types.Part):
+                # Uploaded with the File API: referenced by its URI
+                cv_part = types.Part.from_uri(file_uri=cv_part.uri, mime_type=cv_part.mime_type)
+            content = types.Content(
+                role='user',
+                parts=[types.Part.from_text(text=GEMINI_CV_EXTRACTION_PROMPT_FILE), cv_part],
+            )
+            lines.append(json.dumps({
+                'key': str(applicant.id),
+                'request': {
+                    'contents': [content.model_dump(mode='json', by_alias=True, exclude_none=True)],
+                    'generationConfig': {
+                        'responseMimeType': 'application/json',
+                        'responseSchema': GEMINI_CV_RESPONSE_SCHEMA,
+                    },
+                },
+            }))
+
+        requests_file = call_with_retry(
+            client.files.upload,
+            file=io.BytesIO("\n".join(lines).encode()),
+            config=types.UploadFileConfig(mime_type='jsonl', display_name='odoo-cv-extraction-requests'),
+        )
+        batch = call_with_retry(
+            client.batches.create,
+            model=model_name,
+            src=requests_file.name,
+            config=types.CreateBatchJobConfig(display_name='odoo-cv-extraction'),
+        )
+        _logger.info("Submitted Gemini batch %s with %s applicants", batch.name, len(self))
+        return batch.name
+
+    @api.model
+    def _cron_check_gemini_batches(self):
+        """
+        Cron job: checks the running Gemini batch jobs and, for the
+        finished ones, writes the extracted data of their applicants
+        with the same logic as the synchronous extraction.
+        """
+        pending_applicants = self.search([('gemini_batch_id', '!=', False)])
+        for batch_name, applicants in pending_applicants.grouped('gemini_batch_id').items():
+            applicants = applicants.with_context(**GEMINI_BACKGROUND_CONTEXT)
+            company = applicants[0].company_id or self.env.company
+            if not company.gemini_api_key:
+                # The batch can never be checked: do not poll it forever
+                _logger.warning("Cannot check Gemini batch %s: no API key is set", batch_name)
+                applicants.write({
+                    'gemini_batch_id': False,
+                    'gemini_extract_state': 'error',
+                    'gemini_extract_status': _("Error: Gemini API Key is not set in HR Settings, the batch %s could not be checked.", batch_name),
+                })
+                continue
+            try:
+                client = _get_gemini_client(company.gemini_api_key)
+                batch = client.batches.get(name=batch_name)
+                state = batch.state.name if batch.state else ''
+                if state not in GEMINI_BATCH_DONE_STATES:
+                    continue
+                if state == 'JOB_STATE_SUCCEEDED':
+                    content = client.files.download(file=batch.dest.file_name)
+                    results = self._parse_gemini_batch_results(content)
+            except Exception as e:
+                _logger.warning("Could not check Gemini batch %s: %s", batch_name, str(e))
+                continue
+
+            _logger.info("Gemini batch %s ended with state %s", batch_name, state)
+            if state != 'JOB_STATE_SUCCEEDED':
+                # Failed, cancelled or expired: none of its CVs were extracted
+                applicants.write({
+                    'gemini_batch_id': False,
+                    'gemini_extract_state': 'error',
+                    'gemini_extract_status': _("Error: The Gemini batch %s ended with state %s.", batch_name, state),
+                })
+                continue
+            applicants.write({'gemini_batch_id': False})
+            # The applicants are committed in groups as they are processed
+            applicants._run_gemini_extraction(batch_results=results)
+
+    @api.model
+    def _parse_gemini_batch_results(self, content):
+        """
+        Reads the JSONL results file of a Gemini batch job.
+
+        Returns:
+            dict: {applicant_id: response_text} of the successful requests.
+        """
+        results = {}
+        for line in content.decode().splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            candidates = (item.get('response') or {}).get('candidates') or []
+            if not candidates:
+                _logger.warning("Gemini batch request %s failed: %s", item.get('key'), item.get('error'))
+                continue
+            parts = (candidates[0].get('content') or {}).get('parts') or []
+            results[int(item['key'])] = ''.join(part.get('text', '') for part in parts)
+        return results
+
     def _run_gemini_extraction_in_thread(self, applicant_ids, dbname):
         """
-        Target method for the background thread.
+        Task run by the background thread pool.
         It creates a new, thread-safe environment and cursor
         to process the extraction logic.
         """
@@ -160,7 +524,7 @@ class HrApplicant(models.Model):
             # Create a new cursor for this thread
             with odoo.registry(dbname).cursor() as new_cr:
                 # Create a new environment with the new cursor
-                env = api.Environment(new_cr, self.env.uid, self.env.context)
+                env = api.Environment(new_cr, self.env.uid, dict(self.env.context, **GEMINI_BACKGROUND_CONTEXT))
                 applicants_to_process = env[self._name].browse(applicant_ids)
                 applicants_to_process._run_gemini_extraction()
         except Exception as e:
@@ -172,7 +536,7 @@ class HrApplicant(models.Model):
             # If the whole thread fails, mark all records as error
             try:
                 with odoo.registry(dbname).cursor() as error_cr:
-                    env = api.Environment(error_cr, self.env.uid, self.env.context)
+                    env = api.Environment(error_cr, self.env.uid, dict(self.env.context, **GEMINI_BACKGROUND_CONTEXT))
                     error_self = env[self._name].browse(applicant_ids)
                     error_self.write({
                         'gemini_extract_state': 'error',
@@ -183,15 +547,41 @@ class HrApplicant(models.Model):
                 _logger.error("Could not write thread error state to applicants: %s", str(e2))
 
 
-    def _run_gemini_extraction(self):
+    def _run_gemini_extraction(self, batch_results=None):
         """
         Main extraction logic, designed to be run in a thread.
-        It iterates over each applicant, calls the Gemini API,
-        parses the response, and writes the data.
+        It calls the Gemini API for all the applicants, then iterates
+        over each applicant, parses its response, and writes the data.
         Each applicant is processed in its own transaction savepoint
         to isolate failures.
+
+        Args:
+            batch_results (dict, optional): {applicant_id: response_text}
+                from a Gemini batch job. The API is then not called: the
+                given responses are written instead.
         """
-        for applicant in self:
+        if batch_results is None:
+            # Committed right away, for the UI feedback during the API calls
+            self.write({
+                'gemini_extract_state': 'processing',
+                'gemini_extract_status': _('Processing: Calling Gemini API...'),
+            })
+            self.env.cr.commit()
+            # 2-4. Call the Gemini API for all the CVs at once, except
+            # the CVs already extracted by the same model and prompt (not
+            # for the re-runs, which redo the cached extraction)
+            refresh_ids = set(self.env.context.get('gemini_refresh_cv_cache_ids') or ())
+            cached_responses = self.filtered(lambda a: a.id not in refresh_ids)._get_gemini_cached_responses()
+            responses = dict(cached_responses)
+            responses.update(self.browse(set(self.ids) - set(cached_responses))._gemini_extract_cv_texts())
+        else:
+            # 2-4. The API was called by the Gemini batch job
+            cached_responses = {}
+            responses = batch_results
+
+        # The same few degrees come back for most CVs: look them up in memory
+        degree_cache = self._prefetch_degrees()
+        for index, applicant in enumerate(self, 1):
             skill_status_message = _('Successfully extracted data.')
             gemini_skills_list = []
 
@@ -200,67 +590,45 @@ class HrApplicant(models.Model):
                 # Use a savepoint to roll back this applicant's changes on failure
                 # without affecting other applicants in the loop.
                 with self.env.cr.savepoint():
-                    _logger.info("Starting Gemini extraction for applicant ID: %s", applicant.id)
-                    company = applicant.company_id or self.env.company
-                    api_key = company.gemini_api_key
-                    model_name = company.gemini_model or 'gemini-1.5-flash-latest'
+                    _logger.info("Writing Gemini extraction for applicant ID: %s", applicant.id)
 
                     # 1. Validate Configuration
-                    if not api_key:
-                        raise UserError(_("Gemini API Key is not set in HR Settings."))
-                    if not model_name:
-                        raise UserError(_("Gemini Model is not set in HR Settings."))
-                    if not applicant.message_main_attachment_id:
-                        raise UserError(_("No CV attached."))
-                    
-                    attachment = applicant.message_main_attachment_id
-                    if not attachment.datas:
-                        raise UserError(_("Attached CV is empty."))
-
-                    # 2. Set state to 'processing'
-                    applicant.write({
-                        'gemini_extract_state': 'processing',
-                        'gemini_extract_status': _('Processing: Calling Gemini API...'),
-                    })
+                    dummy, model_name, attachment = applicant._get_gemini_extraction_config()
+
+                    response_text = responses.get(applicant.id)
+                    if isinstance(response_text, Exception):
+                        # The API call failed: handled like any error of this step
+                        raise response_text
+                    if not response_text:
+                        raise UserError(_("Gemini returned no result for this applicant."))
 
-                    # 3. Prepare data for API
-                    # Decode base64 data from Odoo to raw bytes for the API
-                    cv_blob = {
-                        'mime_type': attachment.mimetype,
-                        'data': base64.b64decode(attachment.datas)
-                    }
-
-                    # 4. Configure and call the Gemini API
-                    genai.configure(api_key=api_key)
-                    model = genai.GenerativeModel(model_name)
-                    prompt = GEMINI_CV_EXTRACTION_PROMPT_FILE
-                    
-                    _logger.info("Calling Gemini model '%s' for applicant %s", model_name, applicant.id)
-                    response = model.generate_content([prompt, cv_blob])
-                    
                     _logger.debug(
                         "Gemini Raw Response for Applicant %s:\n%s",
                         applicant.id,
-                        response.text
+                        response_text
                     )
 
                     # 5. Parse Response
-                    applicant.write({
-                        'gemini_extract_status': _('Processing: Parsing response...'),
-                    })
-                    extracted_data = self._parse_gemini_response(response.text)
-                    _logger.info(
-                        "Parsed Data for Applicant %s: \n%s",
-                        applicant.id,
-                        json.dumps(extracted_data, indent=2)
-                    )
+                    extracted_data = self._parse_gemini_response(response_text)
+                    if attachment.checksum and applicant.id not in cached_responses:
+                        self.env['gemini.cv.cache']._store_response(
+                            attachment.checksum, model_name, GEMINI_PROMPT_HASH, response_text)
+                    if _logger.isEnabledFor(logging.INFO):
+                        _logger.info(
+                            "Parsed Data for Applicant %s: \n%s",
+                            applicant.id,
+                            json.dumps(extracted_data, indent=2)
+                        )
 
-                    # 6. Write Simple Fields
-                    applicant._write_extracted_data(extracted_data)
+                    # 6. Write Simple Fields, and the final state in the same write
+                    applicant._write_extracted_data(extracted_data, degree_cache, extra_vals={
+                        'gemini_extract_state': 'done',
+                        'gemini_extract_status': skill_status_message,
+                    })
 
                     # 7. Check for skills to process
                     if (extracted_data.get('skills') and
-                            self.env['ir.module.module']._get('hr_recruitment_skills').state == 'installed'):
+                            self._is_skills_module_installed()):
                         gemini_skills_list = extracted_data.get('skills')
 
                 # --- Transaction Step 2: Process Skills ---
@@ -283,14 +651,9 @@ class HrApplicant(models.Model):
                             "but failed to process skills: %s", str(e_skill)
                         )
                         # The savepoint automatically rolled back the failed skill transaction.
-
-                # --- Transaction Step 3: Commit all successful changes for this applicant ---
-                applicant.write({
-                    'gemini_extract_state': 'done',
-                    'gemini_extract_status': skill_status_message,
-                })
-                # This commits Step 1 and (if successful) Step 2
-                self.env.cr.commit()
+                        applicant.write({
+                            'gemini_extract_status': skill_status_message,
+                        })
 
             except Exception as e:
                 # Catch ALL errors from Step 1 (API, Parse, Write)
@@ -300,23 +663,266 @@ class HrApplicant(models.Model):
                     str(e),
                     exc_info=True
                 )
-                # Rollback any partial changes from the failed transaction
-                self.env.cr.rollback()
+                # The savepoint rolled back the changes of this applicant only,
+                # including the degree it may have created: the cursor is
+                # still usable, and the other applicants are kept.
+                degree_cache = self._prefetch_degrees()
+                applicant.write({
+                    'gemini_extract_state': 'error',
+                    'gemini_extract_status': _("Error: %s", str(e)),
+                })
+
+            # --- Transaction Step 3: Commit the applicants processed so far ---
+            # One commit per GEMINI_COMMIT_INTERVAL applicants (and at the end)
+            # instead of one per applicant.
+            if index % GEMINI_COMMIT_INTERVAL == 0 or index == len(self):
+                self.env.cr.commit()
+
+    def _get_gemini_extraction_config(self):
+        """
+        Checks that the applicant can be extracted.
+
+        Returns:
+            tuple: (api_key, model_name, attachment) to extract it with.
+        """
+        self.ensure_one()
+        company = self.company_id or self.env.company
+        api_key = company.gemini_api_key
+        model_name = company.gemini_model or 'gemini-2.5-flash'
+        if not api_key:
+            raise UserError(_("Gemini API Key is not set in HR Settings."))
+        if not model_name:
+            raise UserError(_("Gemini Model is not set in HR Settings."))
+        if not self.message_main_attachment_id:
+            raise UserError(_("No CV attached."))
+
+        attachment = self.message_main_attachment_id
+        # Checked on the size, to not load the file content yet
+        if not attachment.file_size:
+            raise UserError(_("Attached CV is empty."))
+        return api_key, model_name, attachment
+
+    def _get_gemini_cached_responses(self):
+        """
+        Returns the cached responses for the CVs of `self`, found by the
+        checksum of their attachment, the model of their company and the
+        current prompt (GEMINI_PROMPT_HASH).
 
-                # Use a new cursor to write the error state,
-                # as the current one might be in a failed state.
+        Returns:
+            dict: {applicant_id: response text}, for the cached CVs only.
+        """
+        hashes_by_model = defaultdict(dict)
+        for applicant in self:
+            try:
+                dummy, model_name, attachment = applicant._get_gemini_extraction_config()
+            except UserError:
+                # Reported when the applicant is written
+                continue
+            if attachment.checksum:
+                hashes_by_model[model_name][applicant.id] = attachment.checksum
+
+        cached_responses = {}
+        for model_name, hashes in hashes_by_model.items():
+            responses = self.env['gemini.cv.cache']._get_responses(
+                model_name, GEMINI_PROMPT_HASH, set(hashes.values()))
+            for applicant_id, cv_hash in hashes.items():
+                if cv_hash in responses:
+                    cached_responses[applicant_id] = responses[cv_hash]
+        if cached_responses:
+            _logger.info("Reusing the cached Gemini extraction of %s CVs", len(cached_responses))
+        return cached_responses
+
+    def _gemini_extract_cv_texts(self):
+        """
+        Calls the model for the CVs of all the applicants in `self`.
+        The calls only wait on the network: they run concurrently in an
+        asyncio event loop of the current thread (at most
+        GEMINI_CONCURRENCY at once) instead of one after the other.
+
+        Returns:
+            dict: {applicant_id: response text, or the exception raised}
+        """
+        return asyncio.run(self._gemini_extract_cv_texts_async())
+
+    async def _gemini_extract_cv_texts_async(self):
+        """Coroutine of `_gemini_extract_cv_texts`."""
+        semaphore = asyncio.Semaphore(GEMINI_CONCURRENCY)
+        # Clients of this event loop, keyed by API key
+        clients = {}
+
+        async def extract(applicant):
+            async with semaphore:
                 try:
-                    with odoo.registry(self.env.cr.dbname).cursor() as error_cr:
-                        env = api.Environment(error_cr, self.env.uid, self.env.context)
-                        applicant_rec = env[self._name].browse(applicant.id)
-                        applicant_rec.write({
-                            'gemini_extract_state': 'error',
-                            'gemini_extract_status': _("Error: %s", str(e)),
-                        })
-                        error_cr.commit()
-                except Exception as e2:
-                    _logger.error("Could not write error state to applicant %s: %s", applicant.id, str(e2))
-                    self.env.cr.rollback()
+                    # The ORM is only used between two awaits: the
+                    # coroutines never use the cursor concurrently.
+                    api_key, model_name, attachment = applicant._get_gemini_extraction_config()
+                    if api_key not in clients:
+                        clients[api_key] = _genai().Client(api_key=api_key)
+                    client = clients[api_key]
+                    # The file bytes are sent as is: Gemini reads PDFs natively.
+                    # They are read here, but compressed or uploaded in a
+                    # worker thread, so the other calls go on meanwhile.
+                    cv_file = self._get_gemini_cv_file(attachment)
+                    cv_part = await asyncio.to_thread(_make_gemini_cv_part, client, **cv_file)
+                    _logger.info("Calling Gemini model '%s' for applicant %s", model_name, applicant.id)
+                    response_text = await self._gemini_extract_cv_text(client, api_key, model_name, cv_part)
+                except Exception as e:
+                    return applicant.id, e
+                return applicant.id, response_text
+
+        try:
+            return dict(await asyncio.gather(*(extract(applicant) for applicant in self)))
+        finally:
+            for client in clients.values():
+                await client.aio.aclose()
+                client.close()
+
+    @api.model
+    def _prepare_gemini_cv_part(self, client, attachment):
+        """
+        Returns the content part carrying the CV file for the request.
+        Small files (once compressed) are sent inline; files over the
+        inline limit are uploaded with the File API (uploads expire
+        after 48 hours).
+
+        Args:
+            client (genai.Client): The client used for the extraction.
+            attachment (ir.attachment): The CV attachment.
+        """
+        return _make_gemini_cv_part(client, **self._get_gemini_cv_file(attachment))
+
+    @api.model
+    def _get_gemini_cv_file(self, attachment):
+        """
+        Reads what `_make_gemini_cv_part` needs from the CV attachment:
+        its bytes, which `raw` reads from the filestore (or the database)
+        without the base64 round trip of `datas`. Only PDFs can be
+        compressed under the inline limit: larger files of other types
+        are uploaded from their filestore path instead.
+
+        Returns:
+            dict: The `_make_gemini_cv_part()` keyword arguments.
+        """
+        stream = (
+            attachment.file_size > INLINE_DATA_MAX_SIZE
+            and attachment.mimetype != 'application/pdf'
+            and attachment.store_fname
+        )
+        path = attachment._full_path(attachment.store_fname) if stream else None
+        return {
+            'data': None if path else attachment.raw,
+            'path': path,
+            'mime_type': attachment.mimetype,
+            'name': attachment.name,
+        }
+
+    @api.model
+    async def _gemini_extract_cv_text(self, client, api_key, model_name, cv_part):
+        """
+        Sends the CV to the model and returns the response text, a bare
+        JSON object (see GEMINI_CV_RESPONSE_SCHEMA). With a cached
+        prompt, only the CV is sent. If the cache is gone on the
+        server side (expired or deleted: 403/404), it is recreated and
+        the call retried once.
+        """
+        # The cache lookup may create it, a blocking call made under a
+        # lock shared by all the extraction threads: not in the event loop.
+        prompt_cache = await asyncio.to_thread(self._get_gemini_prompt_cache, client, api_key, model_name)
+        for refresh in (False, True):
+            if refresh:
+                _logger.info("Gemini prompt cache %s is no longer available, recreating it", prompt_cache.name)
+                prompt_cache = await asyncio.to_thread(
+                    self._get_gemini_prompt_cache, client, api_key, model_name, force_refresh=True,
+                )
+            config = _genai().types.GenerateContentConfig(
+                response_mime_type='application/json',
+                response_schema=GEMINI_CV_RESPONSE_SCHEMA,
+            )
+            if prompt_cache:
+                contents = [cv_part]
+                config.cached_content = prompt_cache.name
+            else:
+                contents = [GEMINI_CV_EXTRACTION_PROMPT_FILE, cv_part]
+            try:
+                return await async_call_with_retry(
+                    self._gemini_generate_text,
+                    client,
+                    model=model_name,
+                    contents=contents,
+                    config=config,
+                )
+            except Exception as e:
+                if refresh or not prompt_cache or getattr(e, 'code', None) not in (403, 404):
+                    raise
+
+    @api.model
+    def _get_gemini_prompt_cache(self, client, api_key, model_name, force_refresh=False):
+        """
+        Returns the explicit context cache holding the extraction prompt
+        for the model, creating it if needed. The static prompt is then
+        stored once and reused by every call, instead of being sent (and
+        billed) again for each CV.
+
+        Args:
+            client (genai.Client): A client for `api_key`.
+            api_key (str): The Gemini API key, caches belong to its project.
+            model_name (str): The model the cache is created for.
+            force_refresh (bool): Recreate the cache, e.g. when the
+                                  current one is no longer valid.
+
+        Returns:
+            types.CachedContent: The cache, or False if the model does
+            not support caching or the creation just failed.
+        """
+        key = (api_key, model_name)
+        # Held during the creation, so concurrent extractions create one cache
+        with _PROMPT_CACHES_LOCK:
+            cache = _PROMPT_CACHES.get(key)
+            now = datetime.datetime.now(datetime.timezone.utc)
+            if cache is None and not force_refresh and now < _PROMPT_CACHE_RETRY_AT.get(key, now):
+                return False
+            if force_refresh or cache is None or (cache and cache.expire_time - now < PROMPT_CACHE_REFRESH_MARGIN):
+                try:
+                    cache = client.caches.create(
+                        model=model_name,
+                        config=_genai().types.CreateCachedContentConfig(
+                            system_instruction=GEMINI_CV_EXTRACTION_PROMPT_FILE,
+                            ttl='%ds' % PROMPT_CACHE_TTL.total_seconds(),
+                        ),
+                    )
+                    _logger.info("Created Gemini prompt cache %s for model '%s'", cache.name, model_name)
+                except Exception as e:
+                    if getattr(e, 'code', None) != 400:
+                        # Transient failure: retried after a delay
+                        _logger.warning("Failed to create the Gemini prompt cache for model '%s': %s", model_name, str(e))
+                        _PROMPT_CACHES.pop(key, None)
+                        _PROMPT_CACHE_RETRY_AT[key] = now + PROMPT_CACHE_RETRY_DELAY
+                        return False
+                    # The model does not support caching, or the prompt is too small
+                    _logger.info("Gemini context caching is not available for model '%s': %s", model_name, str(e))
+                    cache = False
+                _PROMPT_CACHES[key] = cache
+                _PROMPT_CACHE_RETRY_AT.pop(key, None)
+        return cache
+
+    @api.model
+    async def _gemini_generate_text(self, client, **kwargs):
+        """
+        Calls the model in streaming mode and returns the full response
+        text. The JSON is generated token by token: streaming receives it
+        as it is produced instead of waiting for the whole body, and keeps
+        the connection active during long generations. It is parsed once
+        complete, as all its fields are needed to write the applicant.
+
+        Args:
+            client (genai.Client): The client used for the extraction.
+            **kwargs: The `generate_content_stream()` arguments.
+
+        Returns:
+            str: The concatenated text of all the chunks.
+        """
+        chunks = await client.aio.models.generate_content_stream(**kwargs)
+        return ''.join([chunk.text or '' async for chunk in chunks])
 
     def _parse_gemini_response(self, response_text):
         """
@@ -324,15 +930,32 @@ class HrApplicant(models.Model):
         expecting it to be a JSON object.
         This is made robust to handle markdown fences (```json)
         or other surrounding text.
+        With the optional `json_repair` library, the response is parsed
+        in a single scan that also repairs truncated or malformed JSON.
         """
+        # The response schema makes the model return bare JSON
+        try:
+            data = _json_loads(response_text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return data
+
+        if json_repair is not None:
+            json_text = response_text.strip().removeprefix('```json').removesuffix('```')
+            data = json_repair.loads(json_text)
+            if isinstance(data, dict):
+                return data
+            # Not a JSON object: reported by the parsing below
+
         try:
             # First, try to find a JSON block fenced by ```json ... ```
-            match = re.search(r"```json\n(.*?)\n```", response_text, re.DOTALL)
+            match = _JSON_FENCE_RE.search(response_text)
             if match:
                 json_text = match.group(1)
             else:
                 # If no fence, look for the first { and last }
-                match = re.search(r"\{.*\}", response_text, re.DOTALL)
+                match = _JSON_OBJ_RE.search(response_text)
                 if match:
                     json_text = match.group(0)
                 else:
@@ -344,7 +967,8 @@ class HrApplicant(models.Model):
                     raise json.JSONDecodeError("No JSON object found in response.", response_text, 0)
 
             json_text = json_text.strip()
-            return json.loads(json_text)
+            # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+            return _json_loads(json_text)
 
         except json.JSONDecodeError as e:
             _logger.error(
@@ -358,19 +982,28 @@ class HrApplicant(models.Model):
                 response_text
             ))
 
-    def _write_extracted_data(self, data):
+    def _write_extracted_data(self, data, degree_cache=None, extra_vals=None):
         """
         Writes the extracted simple fields (name, email, etc.)
         from the JSON data to the applicant record.
         This will overwrite existing data if new data is found.
+
+        Args:
+            data (dict): The extracted data.
+            degree_cache (dict, optional): {lowercase name: degree}, as
+                returned by _prefetch_degrees(). Degrees are searched in
+                it instead of the database, and the created ones added.
+            extra_vals (dict, optional): Other values to write along with
+                the extracted data, to save a separate write.
         """
         self.ensure_one()
+        write_vals = dict(extra_vals or {})
         if not data:
             _logger.warning("No data found to write for applicant %s.", self.id)
+            if write_vals:
+                self.write(write_vals)
             return
 
-        write_vals = {}
-
         if data.get('name'):
             write_vals['partner_name'] = data['name']
             # Also set the main 'name' if it's the default
@@ -393,12 +1026,17 @@ class HrApplicant(models.Model):
             if degree_name:
                 degree_env = self.env['hr.recruitment.degree']
                 # Find existing degree (case-insensitive)
-                degree_rec = degree_env.search([('name', '=ilike', degree_name)], limit=1)
+                if degree_cache is not None:
+                    degree_rec = degree_cache.get(degree_name.lower())
+                else:
+                    degree_rec = degree_env.search([('name', '=ilike', degree_name)], limit=1)
                 if not degree_rec:
                     _logger.info("Creating new degree: %s", degree_name)
                     try:
                         # Create if not found
                         degree_rec = degree_env.create({'name': degree_name})
+                        if degree_cache is not None:
+                            degree_cache[degree_name.lower()] = degree_rec
                     except Exception as e:
                         _logger.error("Failed to create degree '%s': %s", degree_name, str(e))
                         # Don't block the write, just log and continue
@@ -408,15 +1046,40 @@ class HrApplicant(models.Model):
                     write_vals['type_id'] = degree_rec.id
 
         if write_vals:
-            _logger.info(
-                "Writing data for Applicant %s: \n%s",
-                self.id,
-                json.dumps(write_vals, indent=2)
-            )
+            if _logger.isEnabledFor(logging.INFO):
+                _logger.info(
+                    "Writing data for Applicant %s: \n%s",
+                    self.id,
+                    json.dumps(write_vals, indent=2)
+                )
             self.write(write_vals)
         else:
             _logger.info("No new simple data to write for applicant %s.", self.id)
 
+    @api.model
+    def _prefetch_degrees(self):
+        """
+        Returns all the degrees in a single query, for the case-insensitive
+        lookups of _write_extracted_data().
+
+        Returns:
+            dict: {lowercase name: hr.recruitment.degree}, the first degree
+            in the model order for each name, like a search with limit=1.
+        """
+        degree_cache = {}
+        for degree in self.env['hr.recruitment.degree'].search([]):
+            degree_cache.setdefault(degree.name.lower(), degree)
+        return degree_cache
+
+    @api.model
+    @tools.ormcache()
+    def _is_skills_module_installed(self):
+        """
+        Returns whether `hr_recruitment_skills` is installed. Cached for
+        the registry: installing a module reloads it and clears the cache.
+        """
+        return self.env['ir.module.module']._get('hr_recruitment_skills').state == 'installed'
+
     def _get_or_create_default_skill_level(self):
         """
         Finds or creates a 'Beginner (15%)' skill level to use as a fallback
@@ -424,6 +1087,35 @@ class HrApplicant(models.Model):
         Returns:
             hr.skill.level: The default skill level record.
         """
+        default_level = self._find_default_skill_level()
+
+        # 4. Create if it doesn't exist
+        if not default_level:
+            _logger.warning(
+                "No 'Beginner (15%)' skill level found. Creating a new one."
+            )
+            try:
+                default_level = self.env['hr.skill.level'].create({
+                    'name': 'Beginner',
+                    'level_progress': 15
+                })
+            except Exception as e:
+                _logger.error("Failed to create default 'Beginner (15%)' skill level: %s", str(e))
+                raise UserError(_(
+                    "Could not create default 'Beginner (15%)' skill level. "
+                    "Please create one manually in the Skills module. Error: %s"
+                ) % str(e))
+
+        return default_level
+
+    @api.model
+    def _find_default_skill_level(self):
+        """
+        Searches the existing skill level to use as the default one:
+        'Beginner (15%)', any 'Beginner', or else the lowest level.
+        Returns:
+            hr.skill.level: The default skill level, or an empty recordset.
+        """
         skill_level_env = self.env['hr.skill.level']
         default_name = 'Beginner'
         default_progress = 15
@@ -448,25 +1140,93 @@ class HrApplicant(models.Model):
                  limit=1
             )
 
-        # 4. Create if it doesn't exist
-        if not default_level:
-            _logger.warning(
-                "No 'Beginner (15%)' skill level found. Creating a new one."
-            )
-            try:
-                default_level = skill_level_env.create({
-                    'name': default_name,
-                    'level_progress': default_progress
-                })
-            except Exception as e:
-                _logger.error("Failed to create default 'Beginner (15%)' skill level: %s", str(e))
-                raise UserError(_(
-                    "Could not create default 'Beginner (15%)' skill level. "
-                    "Please create one manually in the Skills module. Error: %s"
-                ) % str(e))
+        return default_level
+
+    @api.model
+    @tools.ormcache()
+    def _get_default_skill_level_id(self):
+        """
+        Returns the id of the existing default skill level (False if there
+        is none), cached for the registry. It only searches: a level
+        created by the current transaction is never cached, as that
+        transaction may still be rolled back.
+        """
+        return self._find_default_skill_level().id
+
+    @api.model
+    def _get_default_skill_level(self):
+        """
+        Returns the default skill level, without searching for it on every
+        applicant. When the cached level no longer exists (or none existed
+        yet), it is searched again, and created if needed, without touching
+        the registry caches.
 
+        Returns:
+            hr.skill.level: The default skill level record.
+        """
+        default_level = self.env['hr.skill.level'].browse(self._get_default_skill_level_id()).exists()
+        if not default_level:
+            default_level = self._get_or_create_default_skill_level()
         return default_level
 
+    @api.model
+    def _search_by_lower_name(self, model_name, names):
+        """
+        Searches the records of `model_name` named after any of `names`
+        (case-insensitive) in a single query.
+
+        Returns:
+            dict: {lowercase name: record}, the first record in the
+            model order for each name, like a search with limit=1.
+        """
+        if not names:
+            return {}
+        records = self.env[model_name].search(
+            expression.OR([[('name', '=ilike', name)] for name in names])
+        )
+        result = {}
+        for record in records:
+            result.setdefault(record.name.lower(), record)
+        return result
+
+    @api.model
+    def _prefetch_skill_levels(self, level_strs):
+        """
+        Finds the existing skill levels of the given Gemini level strings
+        in two queries: by name and progress for the "Name (Progress%)"
+        strings, then by the whole string as name for the others.
+
+        Returns:
+            dict: {lowercase level string: hr.skill.level} of the found levels.
+        """
+        if not level_strs:
+            return {}
+        skill_level_env = self.env['hr.skill.level']
+        parsed = {}
+        for level_str in level_strs:
+            match = _LEVEL_RE.match(level_str)
+            if match:
+                parsed[level_str] = (match.group(1).strip(), int(match.group(2)))
+
+        by_name_progress = {}
+        if parsed:
+            levels = skill_level_env.search(expression.OR([
+                [('name', '=ilike', name), ('level_progress', '=', progress)]
+                for name, progress in parsed.values()
+            ]))
+            for level in levels:
+                by_name_progress.setdefault((level.name.lower(), level.level_progress), level)
+        by_name = self._search_by_lower_name('hr.skill.level', level_strs)
+
+        result = {}
+        for level_str in level_strs:
+            name_progress = parsed.get(level_str)
+            level = name_progress and by_name_progress.get((name_progress[0].lower(), name_progress[1]))
+            level = level or by_name.get(level_str.lower())
+            if level:
+                result[level_str.lower()] = level
+        return result
+
     def _process_skills(self, gemini_skills_list):
         """
         Processes the structured skill list from Gemini:
@@ -488,10 +1248,19 @@ class HrApplicant(models.Model):
         skill_env = self.env['hr.skill']
         applicant_skill_env = self.env['hr.applicant.skill']
 
-        # Cache for records found/created in this run to reduce DB queries
-        type_cache = {}
-        level_cache = {}
-        skill_cache = {}
+        # Prefetch the existing types, levels and skills of the whole list
+        # (one query per model), keyed by lowercase name. The loop below
+        # then only creates the missing ones.
+        valid_skills = [s for s in gemini_skills_list if isinstance(s, dict) and s.get('skill')]
+        type_cache = self._search_by_lower_name(
+            'hr.skill.type', {s.get('type') or 'General' for s in valid_skills})
+        skill_cache = self._search_by_lower_name(
+            'hr.skill', {s['skill'] for s in valid_skills})
+        level_cache = self._prefetch_skill_levels(
+            {s['level'] for s in valid_skills if s.get('level')})
+        # Skills already linked to the applicant, and the links to create
+        existing_skill_ids = set(applicant_skill_env.search([('applicant_id', '=', self.id)]).skill_id.ids)
+        link_vals_list = []
 
         # Lazy-load the default level only if needed
         default_level = None
@@ -514,9 +1283,7 @@ class HrApplicant(models.Model):
                 type_name_lower = type_name_str.lower()
                 skill_type = type_cache.get(type_name_lower)
                 if not skill_type:
-                    skill_type = skill_type_env.search([('name', '=ilike', type_name_str)], limit=1)
-                    if not skill_type:
-                        skill_type = skill_type_env.create({'name': type_name_str})
+                    skill_type = skill_type_env.create({'name': type_name_str})
                     type_cache[type_name_lower] = skill_type
 
                 # --- 2. Find or Create Skill Level ---
@@ -525,34 +1292,19 @@ class HrApplicant(models.Model):
                     level_name_lower = level_name_str.lower()
                     skill_level = level_cache.get(level_name_lower)
                     if not skill_level:
-                        # Try to parse "Name (Progress%)"
-                        match = re.match(r"(.+?)\s*\((\d+)%\)", level_name_str)
+                        # Not found: create it if we can parse "Name (Progress%)"
+                        match = _LEVEL_RE.match(level_name_str)
                         if match:
-                            level_name_clean = match.group(1).strip()
-                            level_progress = int(match.group(2))
-                            skill_level = skill_level_env.search([
-                                ('name', '=ilike', level_name_clean),
-                                ('level_progress', '=', level_progress)
-                            ], limit=1)
-                        
-                        # Fallback: search by name only
-                        if not skill_level:
-                            skill_level = skill_level_env.search([('name', '=ilike', level_name_str)], limit=1)
-                        
-                        # Fallback: create it if we have parsed info
-                        if not skill_level and match:
                             skill_level = skill_level_env.create({
-                                'name': level_name_clean,
-                                'level_progress': level_progress
+                                'name': match.group(1).strip(),
+                                'level_progress': int(match.group(2))
                             })
-
-                        if skill_level:
                             level_cache[level_name_lower] = skill_level
 
                 # If no level found/created after all checks, get the default
                 if not skill_level:
                     if not default_level:  # Lazy-load
-                        default_level = self._get_or_create_default_skill_level()
+                        default_level = self._get_default_skill_level()
                     skill_level = default_level
 
                 # --- 3. Associate Level with Type (Fixes NOT NULL constraint) ---
@@ -563,36 +1315,25 @@ class HrApplicant(models.Model):
                 skill_name_lower = skill_name_str.lower()
                 skill = skill_cache.get(skill_name_lower)
                 if not skill:
-                    skill = skill_env.search([('name', '=ilike', skill_name_str)], limit=1)
-                    if not skill:
-                        # Create new skill
-                        skill = skill_env.create({
-                            'name': skill_name_str,
-                            'skill_type_id': skill_type.id
-                        })
-                    elif skill.skill_type_id != skill_type:
-                        # Ensure existing skill has the correct type
-                        skill.write({'skill_type_id': skill_type.id})
-                    
+                    # Create new skill
+                    skill = skill_env.create({
+                        'name': skill_name_str,
+                        'skill_type_id': skill_type.id
+                    })
                     skill_cache[skill_name_lower] = skill
-
-                # --- 5. Create Applicant-Skill Link ---
-                existing_link = applicant_skill_env.search([
-                    ('applicant_id', '=', self.id),
-                    ('skill_id', '=', skill.id)
-                ], limit=1)
-
-                if not existing_link:
-                    applicant_skill_env.create({
+                elif skill.skill_type_id != skill_type:
+                    # Ensure existing skill has the correct type
+                    skill.write({'skill_type_id': skill_type.id})
+
+                # --- 5. Prepare the Applicant-Skill Link ---
+                if skill.id not in existing_skill_ids:
+                    existing_skill_ids.add(skill.id)
+                    link_vals_list.append({
                         'applicant_id': self.id,
                         'skill_id': skill.id,
                         'skill_level_id': skill_level.id,
                         'skill_type_id': skill_type.id,
                     })
-                    _logger.info(
-                        "Created link for applicant %s skill: %s (Type: %s, Level: %s)",
-                        self.id, skill.name, skill_type.name, skill_level.name
-                    )
 
             except Exception as e_item:
                 _logger.error(
@@ -601,3 +1342,11 @@ class HrApplicant(models.Model):
                 )
                 # Re-raise to roll back this applicant's entire skill transaction
                 raise
+
+        # --- 6. Create all the links at once ---
+        if link_vals_list:
+            links = applicant_skill_env.create(link_vals_list)
+            _logger.info(
+                "Created %s skill links for applicant %s: %s",
+                len(links), self.id, ", ".join(links.skill_id.mapped('name'))
+            )
@@ -29,6 +29,7 @@ class ResCompany(models.Model):
     gemini_model = fields.Char(
         string="Gemini Model",
         copy=False,
-        default="gemini-2.5-flash-lite",
-        help="Specify the Gemini model to use (e.g., 'gemini-2.5-flash-latest', 'gemini-2.5-flash-lite')."
+        default="gemini-2.5-flash",
+        help="Specify the Gemini model to use (e.g., 'gemini-2.5-flash', 'gemini-2.5-flash-lite'). "
+             "Flash models are recommended for CV extraction; 'gemini-2.5-pro' is slower and only worth it for hard-to-read CVs."
     )
@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
 import base64
+import datetime
 import json
 import odoo # Import odoo to patch odoo.registry
-import threading
-from unittest.mock import patch, MagicMock
+from collections import namedtuple
+from unittest.mock import patch, AsyncMock, MagicMock
 
-from odoo.tests.common import TransactionCase
+from odoo.tests.common import SingleTransactionCase, TransactionCase
 from odoo.exceptions import UserError
 
-# Import the prompt constant from the model file
-from odoo.addons.hr_recruitment_gemini.models.hr_applicant import GEMINI_CV_EXTRACTION_PROMPT_FILE
+# Import the prompt constant, client and prompt cache registries from the model file
+from odoo.addons.hr_recruitment_gemini.models import hr_applicant as hr_applicant_module
+from odoo.addons.hr_recruitment_gemini.models.hr_applicant import GEMINI_CV_EXTRACTION_PROMPT_FILE, GEMINI_PROMPT_HASH, _GEMINI_CLIENTS, _PROMPT_CACHES, _PROMPT_CACHE_RETRY_AT
 
 # Sample successful response from Gemini
 # This simulates the JSON data we expect the API to return.
@@ -31,11 +33,42 @@ MOCK_GEMINI_RESPONSE_ERROR = "An error occurred."
 # Sample response with invalid JSON
 MOCK_GEMINI_RESPONSE_INVALID_JSON = "Here is the data: { 'name': 'test' "
 
+# Response texts and CV content, serialized once for all the tests
+MOCK_GEMINI_RESPONSE_JSON_TEXT = json.dumps(MOCK_GEMINI_RESPONSE_JSON)
+MOCK_GEMINI_RESPONSE_NAME_TEXT = json.dumps({"name": "John Doe"})
+FAKE_PDF_B64 = base64.b64encode(b'This is a fake PDF content')
 
-class TestHrApplicantGemini(TransactionCase):
+# Chunks of the streamed responses: only their text is read
+_Resp = namedtuple('_Resp', ['text'])
+SUCCESS_RESP = _Resp(MOCK_GEMINI_RESPONSE_JSON_TEXT)
+NAME_RESP = _Resp(MOCK_GEMINI_RESPONSE_NAME_TEXT)
+INVALID_RESP = _Resp(MOCK_GEMINI_RESPONSE_INVALID_JSON)
+
+# Company settings, written as a whole by the tests
+MODE_MANUAL = {'gemini_cv_extract_mode': 'manual_send'}
+MODE_NO_SEND = {'gemini_cv_extract_mode': 'no_send'}
+FAKE_API_KEY = {'gemini_api_key': 'fake_api_key'}
+NO_API_KEY = {'gemini_api_key': False}
+
+
+async def _async_iter(items):
+    """Returns `items` as the async iterator of a streamed response."""
+    for item in items:
+        yield item
+
+
+class FakeExecutor:
+    """Extraction thread pool running the submitted tasks synchronously."""
+    __slots__ = ()
+
+    def submit(self, func, *args):
+        func(*args)
+
+
+class GeminiExtractionTestMixin:
     """
-    Test suite for the `hr.applicant` Gemini extraction functionality.
-    This class mocks the external API call to test the internal logic.
+    Fixtures and patches of the `hr.applicant` Gemini extraction tests.
+    The external API call is mocked to test the internal logic.
     """
 
     @classmethod
@@ -45,20 +78,49 @@ class TestHrApplicantGemini(TransactionCase):
         - Create a test applicant.
         - Create a mock CV attachment.
         - Create required related data (e.g., skill module setup).
+        - Create the degree and skills found by the successful extraction.
         """
         super().setUpClass()
-        
+        # No mail tracking, creation message or follower for the test records
+        cls.env = cls.env(context=dict(
+            cls.env.context,
+            tracking_disable=True,
+            mail_create_nolog=True,
+            mail_create_nosubscribe=True,
+            mail_notrack=True,
+        ))
+
         # Mock the check for hr_recruitment_skills being installed
-        # This avoids a complex module installation during tests.
-        mock_module = MagicMock()
-        mock_module.state = 'installed'
-        
-        cls.mock_get_patcher = patch.object(
-            type(cls.env['ir.module.module']), 
-            '_get', 
-            MagicMock(return_value=mock_module)
+        # This avoids a complex module installation during tests. Only
+        # this check is stubbed: other `ir.module.module` lookups are real.
+        cls.skills_installed_patcher = patch.object(
+            type(cls.env['hr.applicant']),
+            '_is_skills_module_installed',
+            lambda self: True,
         )
-        cls.mock_get_patcher.start()
+        cls.skills_installed_patcher.start()
+
+        # Patch `cr.commit()` and `cr.rollback()` to do nothing, for the whole class.
+        # This is CRITICAL for tests, as committing or rolling back
+        # would break the transaction rollback.
+        cls.commit_patcher = patch('odoo.sql_db.Cursor.commit', lambda *args, **kwargs: None)
+        cls.commit_patcher.start()
+        cls.rollback_patcher = patch('odoo.sql_db.Cursor.rollback', lambda *args, **kwargs: None)
+        cls.rollback_patcher.start()
+
+        # Patch `odoo.registry`, for the whole class.
+        # This intercepts the `odoo.registry(dbname)` call of the extraction
+        # thread: `with registry.cursor() as new_cr:` yields the class cursor,
+        # which every test of the class shares.
+        mock_registry_obj = MagicMock()
+        mock_registry_obj.cursor.return_value.__enter__.return_value = cls.cr
+        cls.cursor_patcher = patch.object(odoo, 'registry', return_value=mock_registry_obj)
+        cls.cursor_patcher.start()
+
+        # The Gemini client patcher is built once, and started by each test.
+        # Its target is resolved here, not by each start().
+        from google import genai
+        cls.client_patcher = patch.object(genai, 'Client')
 
         cls.applicant = cls.env['hr.applicant'].create({
             'name': "Test Applicant's Application",
@@ -66,7 +128,7 @@ class TestHrApplicantGemini(TransactionCase):
 
         cls.attachment = cls.env['ir.attachment'].create({
             'name': 'test_cv.pdf',
-            'datas': base64.b64encode(b'This is a fake PDF content'),
+            'datas': FAKE_PDF_B64,
             'mimetype': 'application/pdf',
             'res_model': 'hr.applicant',
             'res_id': cls.applicant.id,
@@ -74,232 +136,408 @@ class TestHrApplicantGemini(TransactionCase):
         
         cls.applicant.message_main_attachment_id = cls.attachment.id
 
-        cls.env.company.write({
-            'gemini_cv_extract_mode': 'manual_send',
-            'gemini_api_key': 'fake_api_key',
-            'gemini_model': 'fake-model-name',
-        })
+        cls.env.company.write(dict(MODE_MANUAL, **FAKE_API_KEY, gemini_model='fake-model-name'))
         
-        cls.env['hr.skill.level'].create({
-            'name': 'Beginner',
-            'level_progress': 15,
+        # Create REAL records for the extraction to find, one create per model.
+        # This avoids all ForeignKeyViolations and unaccent errors.
+        cls.real_degree = cls.env['hr.recruitment.degree'].create({
+            'name': "Bachelor's Degree in Computer Science"
         })
+        cls.skill_type_prog, cls.skill_type_lang = cls.env['hr.skill.type'].create([
+            {'name': 'Programming Languages'},
+            {'name': 'Languages'},
+        ])
+        dummy, cls.skill_level_adv, cls.skill_level_c1 = cls.env['hr.skill.level'].create([
+            {'name': 'Beginner', 'level_progress': 15},
+            {'name': 'Advanced', 'level_progress': 80},
+            {'name': 'C1', 'level_progress': 85},
+        ])
+        cls.real_skill_py, cls.real_skill_en = cls.env['hr.skill'].create([
+            {'name': 'Python', 'skill_type_id': cls.skill_type_prog.id},
+            {'name': 'English', 'skill_type_id': cls.skill_type_lang.id},
+        ])
 
     @classmethod
     def tearDownClass(cls):
         """Stop class-level patchers."""
+        # Restored before super(), which rolls back the class transaction
+        cls.commit_patcher.stop()
+        cls.rollback_patcher.stop()
+        cls.cursor_patcher.stop()
         super().tearDownClass()
-        cls.mock_get_patcher.stop()
+        cls.skills_installed_patcher.stop()
 
     def setUp(self):
         """
-        Override setUp to prevent `self.env.cr.commit()` from being called
-        inside the threaded function, which would break the test transaction.
-        We also mock the threading itself to run synchronously.
+        Override setUp to mock the thread pool to run synchronously, and
+        the Gemini client.
         """
         super().setUp()
 
-        # 1. Patch `self.env.cr.commit()` and `self.env.cr.rollback()` to do nothing.
-        # This is CRITICAL for tests, as committing or rolling back 
-        # would break the transaction rollback.
-        self.commit_patcher = patch('odoo.sql_db.Cursor.commit', lambda *args, **kwargs: None)
-        self.commit_patcher.start()
-        self.rollback_patcher = patch('odoo.sql_db.Cursor.rollback', lambda *args, **kwargs: None)
-        self.rollback_patcher.start()
-
-
-        # 2. Patch `threading.Thread`
-        # We patch the 'threading.Thread' class itself.
-        # When `threading.Thread(target=..., args=...)` is called,
-        # our side_effect function `mock_thread_constructor` will run.
-        self.thread_patcher = patch('threading.Thread', autospec=True)
-        mock_thread_class = self.thread_patcher.start()
-
-        def mock_thread_constructor(*args, **kwargs):
-            """
-            This mock constructor captures the `target` and `args`
-            and returns a mock instance whose `start` method
-            will run the target function immediately.
-            """
-            target_func = kwargs.get('target')
-            target_args = kwargs.get('args', ())
-            
-            mock_instance = MagicMock()
-            
-            # When `start()` is called on this instance, run the target function
-            mock_instance.start = MagicMock(side_effect=lambda: target_func(*target_args) if target_func else None)
-            
-            return mock_instance
-
-        # Set the side_effect of the mocked class to our constructor function
-        mock_thread_class.side_effect = mock_thread_constructor
-
-        # 3. Patch `odoo.registry`
-        # This intercepts the `odoo.registry(dbname)` call.
-        mock_registry_obj = MagicMock()
-        
-        # This mock context manager will be returned by `mock_registry_obj.cursor()`
-        # It ensures that `with ... as new_cr:` yields the main test cursor.
-        mock_cursor_context_manager = MagicMock()
-        mock_cursor_context_manager.__enter__.return_value = self.env.cr
-        mock_registry_obj.cursor.return_value = mock_cursor_context_manager
-        
-        # `odoo.registry` is a function, so we patch it to return our mock Registry object.
-        self.cursor_patcher = patch('odoo.registry', return_value=mock_registry_obj)
-        self.cursor_patcher.start()
+        # 1. Patch the extraction thread pool
+        # The tasks submitted to the pool are run synchronously.
+        self.executor_patcher = patch.object(hr_applicant_module, '_get_gemini_executor', FakeExecutor)
+        self.executor_patcher.start()
+
+        # 2. Patch the Gemini client
+        # By default, caching is unavailable and the prompt is sent inline.
+        _GEMINI_CLIENTS.clear()
+        _PROMPT_CACHES.clear()
+        _PROMPT_CACHE_RETRY_AT.clear()
+        self.mock_client = self.client_patcher.start().return_value
+        self.addCleanup(self.client_patcher.stop)
+        caching_not_available = Exception("Caching not available")
+        caching_not_available.code = 400
+        self.mock_client.caches.create.side_effect = caching_not_available
+        # The extraction uses the async client: its streamed responses are
+        # served by the synchronous `mock_generate_stream`, which records
+        # the calls and holds the return values and side effects.
+        self.mock_generate_stream = MagicMock()
+        async def generate_content_stream(**kwargs):
+            return _async_iter(self.mock_generate_stream(**kwargs))
+        self.mock_client.aio.models.generate_content_stream = generate_content_stream
+        # The clients of the concurrent extraction are closed after each run
+        self.mock_client.aio.aclose = AsyncMock()
 
 
     def tearDown(self):
         """Stop the patchers after each test."""
-        self.cursor_patcher.stop() # Stop cursor patch
-        self.thread_patcher.stop()
-        self.commit_patcher.stop()
-        self.rollback_patcher.stop() # Stop rollback patch
+        _GEMINI_CLIENTS.clear()
+        _PROMPT_CACHES.clear()
+        _PROMPT_CACHE_RETRY_AT.clear()
+        self.executor_patcher.stop()
         super().tearDown()
 
+
+class TestHrApplicantGemini(GeminiExtractionTestMixin, TransactionCase):
+    """
+    Test suite for the `hr.applicant` Gemini extraction functionality.
+    """
+
     def test_01_successful_extraction(self):
         """
         Test a full, successful extraction and data writing.
         """
-        mock_api_response = MagicMock()
-        mock_api_response.text = json.dumps(MOCK_GEMINI_RESPONSE_JSON)
+        # The degree, skill types, levels and skills are found by the real
+        # (prefetch) searches: they are created in setUpClass. The applicant
+        # has no skill yet, so the real search of its skill links finds none:
+        # no search needs to be patched.
+        self.mock_generate_stream.return_value = [SUCCESS_RESP]
+        self.applicant.action_extract_with_gemini()
 
-        # Create REAL records for the test to find.
-        # This avoids all ForeignKeyViolations and unaccent errors.
-        real_degree = self.env['hr.recruitment.degree'].create({
-            'name': "Bachelor's Degree in Computer Science"
-        })
-        skill_type_prog = self.env['hr.skill.type'].create({'name': 'Programming Languages'})
-        skill_type_lang = self.env['hr.skill.type'].create({'name': 'Languages'})
-        skill_level_adv = self.env['hr.skill.level'].create({'name': 'Advanced', 'level_progress': 80})
-        skill_level_c1 = self.env['hr.skill.level'].create({'name': 'C1', 'level_progress': 85})
-        real_skill_py = self.env['hr.skill'].create({'name': 'Python', 'skill_type_id': skill_type_prog.id})
-        real_skill_en = self.env['hr.skill'].create({'name': 'English', 'skill_type_id': skill_type_lang.id})
-
-        # We patch the `search` method of each model to return the
-        # correct recordset based on the search domain.
-        degree_model = self.env['hr.recruitment.degree']
-        orig_degree_search = degree_model.search
-        def mock_degree_search(domain, *args, **kwargs):
-            if domain == [('name', '=ilike', "Bachelor's Degree in Computer Science")]:
-                return real_degree
-            return orig_degree_search(domain, *args, **kwargs)
-
-        skill_type_model = self.env['hr.skill.type']
-        orig_skill_type_search = skill_type_model.search
-        def mock_skill_type_search(domain, *args, **kwargs):
-            if domain == [('name', '=ilike', 'Programming Languages')]:
-                return skill_type_prog
-            if domain == [('name', '=ilike', 'Languages')]:
-                return skill_type_lang
-            return orig_skill_type_search(domain, *args, **kwargs)
-
-        skill_level_model = self.env['hr.skill.level']
-        orig_skill_level_search = skill_level_model.search
-        def mock_skill_level_search(domain, *args, **kwargs):
-            name_domain = domain[0]
-            if name_domain == ('name', '=ilike', 'Advanced'):
-                return skill_level_adv
-            if name_domain == ('name', '=ilike', 'C1'):
-                return skill_level_c1
-            return orig_skill_level_search(domain, *args, **kwargs)
-
-        skill_model = self.env['hr.skill']
-        orig_skill_search = skill_model.search
-        def mock_skill_search(domain, *args, **kwargs):
-            if domain == [('name', '=ilike', 'Python')]:
-                return real_skill_py
-            if domain == [('name', '=ilike', 'English')]:
-                return real_skill_en
-            return orig_skill_search(domain, *args, **kwargs)
-
-        # Mock applicant skill search to always return empty, forcing creation
-        applicant_skill_model = self.env['hr.applicant.skill']
-        mock_app_skill_search = MagicMock(return_value=applicant_skill_model.browse([]))
-
-        # Patch the `generate_content` method and all relevant search methods
-        with patch('odoo.addons.hr_recruitment_gemini.models.hr_applicant.genai.GenerativeModel.generate_content', return_value=mock_api_response) as mock_gen_content, \
-             patch.object(type(degree_model), 'search', side_effect=mock_degree_search) as mock_degree_search_patch, \
-             patch.object(type(skill_type_model), 'search', side_effect=mock_skill_type_search), \
-             patch.object(type(skill_level_model), 'search', side_effect=mock_skill_level_search), \
-             patch.object(type(skill_model), 'search', side_effect=mock_skill_search), \
-             patch.object(type(applicant_skill_model), 'search', mock_app_skill_search):
-            
-            self.applicant.action_extract_with_gemini()
-            
-            # 1. Check if the API was called correctly
-            mock_gen_content.assert_called_once()
-            call_args = mock_gen_content.call_args[0][0]
-            self.assertIn(GEMINI_CV_EXTRACTION_PROMPT_FILE, call_args) 
-            self.assertEqual(call_args[1]['mime_type'], 'application/pdf')
-            
-            # 2. Check applicant state
-            self.assertEqual(self.applicant.gemini_extract_state, 'done')
-            self.assertEqual(self.applicant.gemini_extract_status, 'Successfully extracted data.')
-
-            # 3. Check simple fields
-            self.assertEqual(self.applicant.partner_name, 'John Doe')
-            self.assertEqual(self.applicant.name, "John Doe's Application")
-            self.assertEqual(self.applicant.email_from, 'john.doe@example.com')
-            self.assertEqual(self.applicant.partner_phone, '123-456-7890')
-            self.assertEqual(self.applicant.linkedin_profile, 'https://linkedin.com/in/johndoe')
-
-            # 4. Check created degree
-            mock_degree_search_patch.assert_called_with(
-                [('name', '=ilike', "Bachelor's Degree in Computer Science")], limit=1
-            )
-            self.assertEqual(self.applicant.type_id.id, real_degree.id)
-            
-            # 5. Check created skills
-            applicant_skills = self.applicant.applicant_skill_ids
-            self.assertEqual(len(applicant_skills), 2)
-            
-            python_skill = applicant_skills.filtered(lambda s: s.skill_id.name == 'Python')
-            self.assertTrue(python_skill)
-            self.assertEqual(python_skill.skill_type_id.name, 'Programming Languages')
-            self.assertEqual(python_skill.skill_level_id.name, 'Advanced')
-            self.assertEqual(python_skill.skill_level_id.level_progress, 80)
-            
-            english_skill = applicant_skills.filtered(lambda s: s.skill_id.name == 'English')
-            self.assertTrue(english_skill)
-            self.assertEqual(english_skill.skill_type_id.name, 'Languages')
-            self.assertEqual(english_skill.skill_level_id.name, 'C1')
-            self.assertEqual(english_skill.skill_level_id.level_progress, 85)
+        # 1. Check if the API was called correctly
+        self.mock_generate_stream.assert_called_once()
+        call_kwargs = self.mock_generate_stream.call_args.kwargs
+        self.assertEqual(call_kwargs['model'], 'fake-model-name')
+        self.assertIn(GEMINI_CV_EXTRACTION_PROMPT_FILE, call_kwargs['contents'])
+        self.assertEqual(call_kwargs['contents'][1].inline_data.mime_type, 'application/pdf')
+        self.assertEqual(call_kwargs['config'].response_mime_type, 'application/json')
+        # The client of the extraction run is closed with its event loop
+        self.mock_client.aio.aclose.assert_awaited_once()
+        
+        # 2. Check applicant state
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+        self.assertEqual(self.applicant.gemini_extract_status, 'Successfully extracted data.')
+
+        # 3. Check simple fields
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+        self.assertEqual(self.applicant.name, "John Doe's Application")
+        self.assertEqual(self.applicant.email_from, 'john.doe@example.com')
+        self.assertEqual(self.applicant.partner_phone, '123-456-7890')
+        self.assertEqual(self.applicant.linkedin_profile, 'https://linkedin.com/in/johndoe')
+
+        # 4. Check the existing degree was found
+        self.assertEqual(self.applicant.type_id.id, self.real_degree.id)
+        
+        # 5. Check created skills
+        applicant_skills = self.applicant.applicant_skill_ids
+        self.assertEqual(len(applicant_skills), 2)
+        
+        python_skill = applicant_skills.filtered(lambda s: s.skill_id.name == 'Python')
+        self.assertTrue(python_skill)
+        self.assertEqual(python_skill.skill_type_id.name, 'Programming Languages')
+        self.assertEqual(python_skill.skill_level_id.name, 'Advanced')
+        self.assertEqual(python_skill.skill_level_id.level_progress, 80)
+        
+        english_skill = applicant_skills.filtered(lambda s: s.skill_id.name == 'English')
+        self.assertTrue(english_skill)
+        self.assertEqual(english_skill.skill_type_id.name, 'Languages')
+        self.assertEqual(english_skill.skill_level_id.name, 'C1')
+        self.assertEqual(english_skill.skill_level_id.level_progress, 85)
 
     def test_02_api_call_failure(self):
         """
         Test how the system handles a direct exception from the API call.
         """
-        # Patch `generate_content` to raise an exception
-        with patch('odoo.addons.hr_recruitment_gemini.models.hr_applicant.genai.GenerativeModel.generate_content', side_effect=Exception(MOCK_GEMINI_RESPONSE_ERROR)):
-            
-            self.applicant.action_extract_with_gemini()
-            
-            self.assertEqual(self.applicant.gemini_extract_state, 'error')
-            self.assertIn(MOCK_GEMINI_RESPONSE_ERROR, self.applicant.gemini_extract_status)
-            self.assertEqual(self.applicant.partner_name, False)
+        # Make the streaming call raise an exception
+        self.mock_generate_stream.side_effect = Exception(MOCK_GEMINI_RESPONSE_ERROR)
+
+        self.applicant.action_extract_with_gemini()
+
+        self.assertEqual(self.applicant.gemini_extract_state, 'error')
+        self.assertIn(MOCK_GEMINI_RESPONSE_ERROR, self.applicant.gemini_extract_status)
+        self.assertEqual(self.applicant.partner_name, False)
 
     def test_03_invalid_json_response(self):
         """
         Test how the system handles a response that is not valid JSON.
         """
-        mock_api_response = MagicMock()
-        mock_api_response.text = MOCK_GEMINI_RESPONSE_INVALID_JSON
-        
-        with patch('odoo.addons.hr_recruitment_gemini.models.hr_applicant.genai.GenerativeModel.generate_content', return_value=mock_api_response):
+        self.mock_generate_stream.return_value = [INVALID_RESP]
 
+        # json_repair (if installed) would repair this response
+        with patch.object(hr_applicant_module, 'json_repair', None):
             self.applicant.action_extract_with_gemini()
-            
-            self.assertEqual(self.applicant.gemini_extract_state, 'error')
-            self.assertIn("invalid response that could not be parsed", self.applicant.gemini_extract_status)
-            self.assertIn(MOCK_GEMINI_RESPONSE_INVALID_JSON, self.applicant.gemini_extract_status)
-            self.assertEqual(self.applicant.partner_name, False)
+
+        self.assertEqual(self.applicant.gemini_extract_state, 'error')
+        self.assertIn("invalid response that could not be parsed", self.applicant.gemini_extract_status)
+        self.assertIn(MOCK_GEMINI_RESPONSE_INVALID_JSON, self.applicant.gemini_extract_status)
+        self.assertEqual(self.applicant.partner_name, False)
+
+    def test_06_cached_prompt(self):
+        """
+        Test that, when a context cache is available, only the CV is sent
+        and the cache is created once for several extractions.
+        """
+        mock_cache = MagicMock()
+        mock_cache.name = 'cachedContents/fake-cache'
+        mock_cache.expire_time = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        mock_cache_create = self.mock_client.caches.create
+        mock_cache_create.side_effect = None
+        mock_cache_create.return_value = mock_cache
+        self.mock_generate_stream.return_value = [NAME_RESP]
+
+        self.applicant.action_extract_with_gemini()
+        # A re-run calls the API again, instead of reusing the extraction of the CV
+        self.applicant.action_extract_with_gemini()
+
+        mock_cache_create.assert_called_once()
+        self.assertEqual(
+            mock_cache_create.call_args.kwargs['config'].system_instruction,
+            GEMINI_CV_EXTRACTION_PROMPT_FILE
+        )
+
+        # The prompt is in the cache: only the CV blob is sent
+        call_kwargs = self.mock_generate_stream.call_args.kwargs
+        self.assertEqual(call_kwargs['config'].cached_content, 'cachedContents/fake-cache')
+        self.assertEqual(len(call_kwargs['contents']), 1)
+        self.assertEqual(call_kwargs['contents'][0].inline_data.mime_type, 'application/pdf')
+
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+
+    def test_07_prompt_cache_refresh(self):
+        """
+        Test that a prompt cache no longer available on the server side
+        (404) is recreated, and the call retried once with the new cache.
+        """
+        expire_time = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        old_cache = MagicMock(expire_time=expire_time)
+        old_cache.name = 'cachedContents/old-cache'
+        new_cache = MagicMock(expire_time=expire_time)
+        new_cache.name = 'cachedContents/new-cache'
+        mock_cache_create = self.mock_client.caches.create
+        mock_cache_create.side_effect = [old_cache, new_cache]
+
+        cache_not_found = Exception("Cached content not found")
+        cache_not_found.code = 404
+        self.mock_generate_stream.side_effect = [cache_not_found, [NAME_RESP]]
+
+        self.applicant.action_extract_with_gemini()
+
+        self.assertEqual(mock_cache_create.call_count, 2)
+        self.assertEqual(self.mock_generate_stream.call_count, 2)
+        call_kwargs = self.mock_generate_stream.call_args.kwargs
+        self.assertEqual(call_kwargs['config'].cached_content, 'cachedContents/new-cache')
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+
+    def test_08_batch_extraction(self):
+        """
+        Test the Gemini Batch Mode: the CVs are submitted as one batch
+        job, then the cron writes the results once the job succeeded.
+        """
+        mock_batch = MagicMock()
+        mock_batch.name = 'batches/fake-batch'
+        self.mock_client.batches.create.return_value = mock_batch
+
+        # 1. Submit the batch
+        self.applicant.action_extract_with_gemini_batch()
+
+        self.assertEqual(self.applicant.gemini_batch_id, 'batches/fake-batch')
+        self.assertEqual(self.applicant.gemini_extract_state, 'pending')
+        requests_file = self.mock_client.files.upload.call_args.kwargs['file']
+        request_line = json.loads(requests_file.getvalue().decode().splitlines()[0])
+        self.assertEqual(request_line['key'], str(self.applicant.id))
+        parts = request_line['request']['contents'][0]['parts']
+        self.assertEqual(parts[0]['text'], GEMINI_CV_EXTRACTION_PROMPT_FILE)
+        self.assertEqual(parts[1]['inlineData']['mimeType'], 'application/pdf')
+
+        # 2. The cron processes the finished batch
+        mock_batch.state.name = 'JOB_STATE_SUCCEEDED'
+        mock_batch.dest.file_name = 'files/fake-results'
+        self.mock_client.batches.get.return_value = mock_batch
+        self.mock_client.files.download.return_value = json.dumps({
+            'key': str(self.applicant.id),
+            'response': {'candidates': [{'content': {'parts': [{'text': MOCK_GEMINI_RESPONSE_NAME_TEXT}]}}]},
+        }).encode()
+
+        self.env['hr.applicant']._cron_check_gemini_batches()
+
+        self.mock_client.batches.get.assert_called_once_with(name='batches/fake-batch')
+        self.mock_generate_stream.assert_not_called()
+        self.assertFalse(self.applicant.gemini_batch_id)
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+
+    def test_09_cv_cache(self):
+        """
+        Test that the extraction of a CV is cached: extracting the same
+        CV again (e.g. for another application) reuses it instead of
+        calling the API, but a re-run of the extraction redoes it.
+        """
+        self.mock_generate_stream.return_value = [NAME_RESP]
+
+        self.applicant.action_extract_with_gemini()
+        # The same CV, not extracted yet for this application
+        self.applicant.write({'gemini_extract_state': 'no_extract', 'partner_name': False})
+        self.applicant.action_extract_with_gemini()
+
+        self.mock_generate_stream.assert_called_once()
+        cache_entry = self.env['gemini.cv.cache'].search([('cv_hash', '=', self.attachment.checksum)])
+        self.assertEqual(cache_entry.model_name, 'fake-model-name')
+        self.assertEqual(cache_entry.prompt_hash, GEMINI_PROMPT_HASH)
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+        self.assertEqual(self.applicant.partner_name, 'John Doe')
+
+        # The user retries the done extraction: the API is called again,
+        # and its new response replaces the cached one
+        self.mock_generate_stream.return_value = [SUCCESS_RESP]
+        self.applicant.action_extract_with_gemini()
+
+        self.assertEqual(self.mock_generate_stream.call_count, 2)
+        # Stored with raw SQL: read it again
+        cache_entry.invalidate_recordset()
+        self.assertEqual(cache_entry.response_text, MOCK_GEMINI_RESPONSE_JSON_TEXT)
+        self.assertEqual(self.applicant.email_from, 'john.doe@example.com')
+
+    def test_10_batch_not_succeeded(self):
+        """
+        Test that the cron ends the batches that failed or expired, and
+        the ones it cannot check (no API key): their applicants are set
+        in error instead of staying pending forever.
+        """
+        mock_batch = MagicMock()
+        self.mock_client.batches.get.return_value = mock_batch
+        for state in ('JOB_STATE_FAILED', 'JOB_STATE_EXPIRED'):
+            with self.subTest(state=state):
+                mock_batch.state.name = state
+                self.applicant.write({'gemini_batch_id': 'batches/fake-batch', 'gemini_extract_state': 'pending'})
+
+                self.env['hr.applicant']._cron_check_gemini_batches()
+
+                self.mock_generate_stream.assert_not_called()
+                self.mock_client.files.download.assert_not_called()
+                self.assertFalse(self.applicant.gemini_batch_id)
+                self.assertEqual(self.applicant.gemini_extract_state, 'error')
+                self.assertIn(state, self.applicant.gemini_extract_status)
+
+        self.env.company.write(NO_API_KEY)
+        self.applicant.write({'gemini_batch_id': 'batches/fake-batch', 'gemini_extract_state': 'pending'})
+        self.mock_client.batches.get.reset_mock()
+
+        self.env['hr.applicant']._cron_check_gemini_batches()
+
+        self.mock_client.batches.get.assert_not_called()
+        self.assertFalse(self.applicant.gemini_batch_id)
+        self.assertEqual(self.applicant.gemini_extract_state, 'error')
+        self.assertIn("API Key is not set", self.applicant.gemini_extract_status)
+
+    def test_11_batch_empty_cv(self):
+        """
+        Test that a Batch Mode extraction does not send empty CVs: their
+        applicants are set in error, and no batch is submitted for them.
+        """
+        self.attachment.raw = b''
+
+        self.applicant.action_extract_with_gemini_batch()
+
+        self.mock_client.batches.create.assert_not_called()
+        self.assertFalse(self.applicant.gemini_batch_id)
+        self.assertEqual(self.applicant.gemini_extract_state, 'error')
+        self.assertIn("Attached CV is empty", self.applicant.gemini_extract_status)
+
+    def test_12_prompt_cache_transient_failure(self):
+        """
+        Test that a prompt cache creation failing for another reason than
+        the model (e.g. a timeout) is not remembered: the prompt is sent
+        inline, and the creation retried after a delay.
+        """
+        mock_cache = MagicMock()
+        mock_cache.name = 'cachedContents/fake-cache'
+        mock_cache.expire_time = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=1)
+        mock_cache_create = self.mock_client.caches.create
+        mock_cache_create.side_effect = [Exception("Deadline exceeded"), mock_cache]
+        self.mock_generate_stream.return_value = [NAME_RESP]
+
+        self.applicant.action_extract_with_gemini()
+
+        call_kwargs = self.mock_generate_stream.call_args.kwargs
+        self.assertFalse(call_kwargs['config'].cached_content)
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+
+        # Not retried before the delay
+        self.applicant.action_extract_with_gemini()
+        self.assertEqual(mock_cache_create.call_count, 1)
+
+        # Retried once the delay passed
+        _PROMPT_CACHE_RETRY_AT.clear()
+        self.applicant.action_extract_with_gemini()
+        self.assertEqual(mock_cache_create.call_count, 2)
+        call_kwargs = self.mock_generate_stream.call_args.kwargs
+        self.assertEqual(call_kwargs['config'].cached_content, 'cachedContents/fake-cache')
+
+    def test_13_compressed_cv_sent_inline(self):
+        """
+        Test that the CV is compressed before choosing how to send it: a
+        PDF over the inline limit is sent inline once compressed under
+        it, and uploaded with the File API otherwise.
+        """
+        self.mock_generate_stream.return_value = [NAME_RESP]
+        inline_max_size = patch.object(hr_applicant_module, 'INLINE_DATA_MAX_SIZE', self.attachment.file_size - 1)
+
+        with inline_max_size, patch.object(hr_applicant_module, 'compress_pdf', return_value=b'%PDF-1.4'):
+            self.applicant.action_extract_with_gemini()
+
+        self.mock_client.files.upload.assert_not_called()
+        call_kwargs = self.mock_generate_stream.call_args.kwargs
+        self.assertEqual(call_kwargs['contents'][1].inline_data.data, b'%PDF-1.4')
+
+        with inline_max_size, patch.object(hr_applicant_module, 'compress_pdf', side_effect=lambda data, mimetype: data):
+            self.applicant.action_extract_with_gemini()
+
+        self.mock_client.files.upload.assert_called_once()
+        self.assertEqual(self.applicant.gemini_extract_state, 'done')
+
+
+class TestHrApplicantGeminiReadOnly(GeminiExtractionTestMixin, SingleTransactionCase):
+    """
+    Tests that only change the company API key and the applicant state:
+    they share a single transaction, and restore both after each test.
+    """
+
+    def tearDown(self):
+        self.env.company.write(FAKE_API_KEY)
+        self.applicant.write({
+            'gemini_extract_state': 'no_extract',
+            'gemini_extract_status': False,
+        })
+        super().tearDown()
 
     def test_04_no_api_key(self):
         """
         Test that the extraction fails if the API key is not set.
         """
-        self.env.company.gemini_api_key = False
+        self.env.company.write(NO_API_KEY)
         
         self.applicant.action_extract_with_gemini()
         
@@ -309,32 +547,29 @@ class TestHrApplicantGemini(TransactionCase):
     def test_05_can_extract_with_gemini_compute(self):
         """
         Test the logic of the `can_extract_with_gemini` compute field.
+        The cases are in-memory (new) records: nothing is written.
         """
-        # 1. Correct state: manual mode, attachment, valid state
-        self.env.company.gemini_cv_extract_mode = 'manual_send'
-        self.applicant.message_main_attachment_id = self.attachment
-        self.applicant.gemini_extract_state = 'no_extract'
-        self.assertTrue(self.applicant.can_extract_with_gemini)
-        
-        # 2. Test 'done' state (should allow retry)
-        self.applicant.gemini_extract_state = 'done'
-        self.assertTrue(self.applicant.can_extract_with_gemini)
-        
-        # 3. Test 'error' state (should allow retry)
-        self.applicant.gemini_extract_state = 'error'
-        self.assertTrue(self.applicant.can_extract_with_gemini)
-
-        # 4. Wrong mode (no_send)
-        self.env.company.gemini_cv_extract_mode = 'no_send'
-        self.assertFalse(self.applicant.can_extract_with_gemini)
-        
-        # 5. Wrong state (processing)
-        self.env.company.gemini_cv_extract_mode = 'manual_send'
-        self.applicant.gemini_extract_state = 'processing'
-        self.assertFalse(self.applicant.can_extract_with_gemini)
-        
-        # 6. No attachment
-        self.applicant.gemini_extract_state = 'no_extract'
-        self.applicant.message_main_attachment_id = False
-        self.assertFalse(self.applicant.can_extract_with_gemini)
-
+        manual_company = self.env['res.company'].new(MODE_MANUAL)
+        no_send_company = self.env['res.company'].new(MODE_NO_SEND)
+        cases = [
+            # 1. Correct state: manual mode, attachment, valid state
+            ('no_extract', manual_company, self.attachment, True),
+            # 2. Test 'done' state (should allow retry)
+            ('done', manual_company, self.attachment, True),
+            # 3. Test 'error' state (should allow retry)
+            ('error', manual_company, self.attachment, True),
+            # 4. Wrong mode (no_send)
+            ('error', no_send_company, self.attachment, False),
+            # 5. Wrong state (processing)
+            ('processing', manual_company, self.attachment, False),
+            # 6. No attachment
+            ('no_extract', manual_company, False, False),
+        ]
+        for state, company, attachment, expected in cases:
+            with self.subTest(state=state, mode=company.gemini_cv_extract_mode, attachment=bool(attachment)):
+                applicant = self.env['hr.applicant'].new({
+                    'gemini_extract_state': state,
+                    'company_id': company,
+                    'message_main_attachment_id': attachment,
+                })
+                self.assertEqual(applicant.can_extract_with_gemini, expected)
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+{
+    'name': 'HR Recruitment LLM Utils',
+    'version': '17.0.1.0.0',
+    'category': 'Human Resources/Recruitment',
+    'summary': "Shared helpers of the CV extraction addons.",
+    'description': """
+Technical module holding the helpers shared by the OpenAI and Gemini
+CV extraction addons, so they are maintained in a single place:
+- the retries of the rate-limited (HTTP 429) API calls, with the same
+  backoff for both providers;
+- the downsampling of scanned PDF CVs before they are sent (with the
+  optional pikepdf library).
+    """,
+    'author': 'alextranduil',
+    'website': '',
+    'depends': [
+        'base',
+    ],
+    'data': [],
+    'license': 'LGPL-3',
+    'installable': True,
+    'application': False,
+    'auto_install': False,
+}
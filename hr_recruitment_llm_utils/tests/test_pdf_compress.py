@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import io
+import random
+import unittest
+from unittest.mock import patch
+
+from odoo.tests.common import BaseCase
+
+from odoo.addons.hr_recruitment_llm_utils.utils import pdf_compress
+from odoo.addons.hr_recruitment_llm_utils.utils.pdf_compress import compress_pdf, pikepdf
+
+# Size (in pixels) of the test images: far above TARGET_DPI on a 1 inch page
+IMAGE_SIZE = 400
+
+
+@unittest.skipIf(pikepdf is None, "pikepdf is not installed")
+class TestPdfCompress(BaseCase):
+    """
+    Test suite for the downsampling of scanned PDF CVs, on a real PDF
+    with a plain image, a masked image and an image drawn by a form.
+    """
+
+    def _make_image(self, pdf, colorspace, components, **extra):
+        """Returns a new uncompressed image of random (incompressible) pixels."""
+        rng = random.Random(len(pdf.objects))
+        return pikepdf.Stream(
+            pdf,
+            rng.randbytes(IMAGE_SIZE * IMAGE_SIZE * components),
+            Type=pikepdf.Name.XObject,
+            Subtype=pikepdf.Name.Image,
+            Width=IMAGE_SIZE,
+            Height=IMAGE_SIZE,
+            ColorSpace=colorspace,
+            BitsPerComponent=8,
+            **extra,
+        )
+
+    def _make_pdf(self):
+        """
+        Returns a one page (1x1 inch) PDF drawing a plain RGB image, an
+        RGB image with a transparency mask, and a form drawing another
+        RGB image.
+        """
+        pdf = pikepdf.new()
+        page = pdf.add_blank_page(page_size=(72, 72))
+        smask = self._make_image(pdf, pikepdf.Name.DeviceGray, 1)
+        form = pikepdf.Stream(
+            pdf,
+            b'q 72 0 0 72 0 0 cm /Im0 Do Q',
+            Type=pikepdf.Name.XObject,
+            Subtype=pikepdf.Name.Form,
+            BBox=[0, 0, 72, 72],
+            Resources=pikepdf.Dictionary(XObject=pikepdf.Dictionary(
+                Im0=self._make_image(pdf, pikepdf.Name.DeviceRGB, 3),
+            )),
+        )
+        page.obj.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(
+            Im1=self._make_image(pdf, pikepdf.Name.DeviceRGB, 3),
+            Im2=self._make_image(pdf, pikepdf.Name.DeviceRGB, 3, SMask=smask),
+            Fm1=form,
+        ))
+        page.obj.Contents = pikepdf.Stream(
+            pdf, b'q 72 0 0 72 0 0 cm /Im1 Do /Im2 Do Q /Fm1 Do',
+        )
+        output = io.BytesIO()
+        pdf.save(output)
+        return output.getvalue()
+
+    def test_01_downsample_images(self):
+        """
+        Test that the plain and form images are downsampled to JPEG, and
+        that the masked image and its mask are kept as they are.
+        """
+        data = self._make_pdf()
+        with patch.object(pdf_compress, 'MIN_PAGE_SIZE', 0):
+            compressed = compress_pdf(data, 'application/pdf')
+        self.assertLess(len(compressed), len(data))
+
+        with pikepdf.open(io.BytesIO(compressed)) as pdf:
+            xobjects = pdf.pages[0].obj.Resources.XObject
+            form_image = xobjects.Fm1.Resources.XObject.Im0
+            for image in (xobjects.Im1, form_image):
+                self.assertEqual(image.Filter, pikepdf.Name.DCTDecode)
+                self.assertEqual(image.Width, pdf_compress.TARGET_DPI)
+                self.assertEqual(image.Height, pdf_compress.TARGET_DPI)
+
+            masked_image = xobjects.Im2
+            for image in (masked_image, masked_image.SMask):
+                self.assertNotEqual(image.Filter, pikepdf.Name.DCTDecode)
+                self.assertEqual(image.Width, IMAGE_SIZE)
+                self.assertEqual(image.Height, IMAGE_SIZE)
+
+    def test_02_not_a_pdf(self):
+        """Test that other file types are returned unchanged."""
+        data = b'Not a PDF'
+        self.assertIs(compress_pdf(data, 'image/png'), data)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Retry policy for rate-limited (HTTP 429) API calls.
+MAX_ATTEMPTS = 6
+MAX_DELAY = 60.0
+
+
+def is_rate_limit_error(exc):
+    """
+    Returns True if `exc` is a rate-limit (HTTP 429) error.
+    Works with the OpenAI and Google SDK exceptions, which expose the
+    HTTP status as `status_code` or `code`.
+    """
+    code = getattr(exc, 'status_code', None) or getattr(exc, 'code', None)
+    return code == 429
+
+
+def get_retry_after(exc):
+    """
+    Returns the delay (in seconds) suggested by the server for a
+    rate-limit error, read from a `retry_after` attribute or from the
+    `Retry-After` header of the HTTP response. None if not available.
+    """
+    retry_after = getattr(exc, 'retry_after', None)
+    if retry_after is None:
+        response = getattr(exc, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        retry_after = headers.get('retry-after')
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_retry_delay(exc, attempt):
+    """
+    Returns the delay (in seconds) to wait before the next attempt:
+    the server suggested delay, or an exponential backoff (1s, 2s, 4s, ...),
+    capped to MAX_DELAY.
+    """
+    delay = get_retry_after(exc)
+    if delay is None:
+        delay = 2 ** attempt
+    return min(delay, MAX_DELAY)
+
+
+def call_with_retry(func, *args, **kwargs):
+    """
+    Calls `func(*args, **kwargs)`, retrying it while it fails with a
+    rate-limit error. Waits for the delay suggested by the server, or
+    for a capped exponential backoff (1s, 2s, 4s, ...).
+    After MAX_ATTEMPTS, the last error is re-raised so the caller can
+    fail or reschedule the work.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = _get_retry_delay(e, attempt)
+            _logger.warning(
+                "Rate limited (attempt %s/%s), retrying in %.1fs: %s",
+                attempt + 1, MAX_ATTEMPTS, delay, str(e)
+            )
+            time.sleep(delay)
+
+
+async def async_call_with_retry(func, *args, **kwargs):
+    """
+    Same as `call_with_retry` for a coroutine function: awaits
+    `func(*args, **kwargs)` and sleeps without blocking the event loop
+    between attempts.
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = _get_retry_delay(e, attempt)
+            _logger.warning(
+                "Rate limited (attempt %s/%s), retrying in %.1fs: %s",
+                attempt + 1, MAX_ATTEMPTS, delay, str(e)
+            )
+            await asyncio.sleep(delay)
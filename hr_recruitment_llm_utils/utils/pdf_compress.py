@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+import io
+import logging
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+from PIL import Image
+
+_logger = logging.getLogger(__name__)
+
+# Raster images of scanned CVs are downsampled to this resolution and
+# re-encoded as JPEG: plenty for the model to read the text.
+TARGET_DPI = 150
+JPEG_QUALITY = 75
+# PDFs under this average size per page are mostly text: left as is.
+MIN_PAGE_SIZE = 500 * 1024
+
+
+def compress_pdf(data, mimetype):
+    """
+    Shrinks a scanned PDF before it is sent to the LLM, by downsampling
+    its raster images to TARGET_DPI and re-encoding them as JPEG.
+    Requires the optional `pikepdf` library: without it, or for other
+    file types, small PDFs or any error, `data` is returned unchanged.
+
+    Args:
+        data (bytes): The file content.
+        mimetype (str): The file mimetype.
+
+    Returns:
+        bytes: The compressed PDF, or `data` if it could not be made smaller.
+    """
+    if pikepdf is None or mimetype != 'application/pdf':
+        return data
+    try:
+        with pikepdf.open(io.BytesIO(data)) as pdf:
+            if not pdf.pages or len(data) / len(pdf.pages) < MIN_PAGE_SIZE:
+                return data
+            seen = set()
+            for page in pdf.pages:
+                _downsample_page_images(page, seen)
+            output = io.BytesIO()
+            pdf.save(output, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    except Exception as e:
+        _logger.warning("Could not compress PDF, sending it as is: %s", str(e))
+        return data
+
+    compressed = output.getvalue()
+    if len(compressed) >= len(data):
+        return data
+    _logger.info("Compressed PDF from %s to %s bytes", len(data), len(compressed))
+    return compressed
+
+
+def _downsample_page_images(page, seen):
+    """
+    Re-encodes in place the images of `page` above TARGET_DPI as JPEG,
+    including the images drawn by its form XObjects.
+
+    Args:
+        page (pikepdf.Page): The page.
+        seen (set): The (object, generation) numbers of the images and
+                    forms already handled, shared by all the pages.
+    """
+    # Largest image size (in pixels) needed to cover the page at TARGET_DPI
+    x0, y0, x1, y1 = (float(v) for v in page.mediabox)
+    max_width = abs(x1 - x0) / 72 * TARGET_DPI
+    max_height = abs(y1 - y0) / 72 * TARGET_DPI
+
+    for raw_image in _iter_images(page.obj.get('/Resources'), seen):
+        # Transparency masks and masked images are kept as is: JPEG has
+        # no alpha, and a mask must keep the size of its image.
+        if '/SMask' in raw_image or '/Mask' in raw_image or raw_image.get('/ImageMask', False):
+            continue
+        try:
+            image = pikepdf.PdfImage(raw_image).as_pil_image()
+        except Exception:
+            # Unsupported encoding (e.g. JBIG2): keep the original image
+            continue
+        # Only plain gray, RGB and CMYK images are re-encoded: bilevel scans
+        # are smaller in their original (CCITT/JBIG2) encoding, and palette
+        # or alpha images would lose their colors or transparency.
+        if image.mode not in ('L', 'RGB', 'CMYK'):
+            continue
+
+        scale = min(1.0, max(max_width / image.width, max_height / image.height))
+        if image.mode == 'CMYK':
+            image = image.convert('RGB')
+        if scale < 1.0:
+            image = image.resize(
+                (max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                Image.LANCZOS,
+            )
+        jpeg = io.BytesIO()
+        image.save(jpeg, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+        if jpeg.tell() >= len(raw_image.read_raw_bytes()):
+            continue
+
+        raw_image.write(jpeg.getvalue(), filter=pikepdf.Name.DCTDecode)
+        raw_image.Width = image.width
+        raw_image.Height = image.height
+        raw_image.BitsPerComponent = 8
+        raw_image.ColorSpace = pikepdf.Name.DeviceGray if image.mode == 'L' else pikepdf.Name.DeviceRGB
+        for key in ('/DecodeParms', '/Decode'):
+            if key in raw_image:
+                del raw_image[key]
+
+
+def _iter_images(resources, seen):
+    """
+    Yields the image XObjects of a resources dictionary, and of the form
+    XObjects it holds (recursively). Each object is yielded once: images
+    and forms are often shared by several pages.
+    """
+    xobjects = resources.get('/XObject') if resources is not None else None
+    if not xobjects:
+        return
+    for _name, xobject in xobjects.items():
+        if not isinstance(xobject, pikepdf.Stream) or xobject.objgen in seen:
+            continue
+        if xobject.is_indirect:
+            seen.add(xobject.objgen)
+        if xobject.get('/Subtype') == '/Image':
+            yield xobject
+        elif xobject.get('/Subtype') == '/Form':
+            yield from _iter_images(xobject.get('/Resources'), seen)
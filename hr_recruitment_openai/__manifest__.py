@@ -15,6 +15,7 @@ applicant's name, email, phone, skills, and degree.
         'hr_recruitment',
         'mail',
         'hr_recruitment_skills',
+        'hr_recruitment_llm_utils',
     ],
     'data': [
         'security/ir.model.access.csv',
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 import base64
-import openai
 import json
 import logging
 import odoo
@@ -9,9 +8,25 @@ import threading
 
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from odoo.osv import expression
+
+from odoo.addons.hr_recruitment_llm_utils.utils.llm_retry import call_with_retry, is_rate_limit_error
+from odoo.addons.hr_recruitment_llm_utils.utils.pdf_compress import compress_pdf
 
 _logger = logging.getLogger(__name__)
 
+# The OpenAI SDK is heavy to import (tens of MB per worker): it is only
+# imported the first time a CV is scanned, see _openai().
+_OPENAI_CACHE = {}
+
+
+def _openai():
+    """Returns the `openai` module, imported on first use."""
+    if 'openai' not in _OPENAI_CACHE:
+        import openai
+        _OPENAI_CACHE['openai'] = openai
+    return _OPENAI_CACHE['openai']
+
 # This system prompt instructs the OpenAI model to act as an HR assistant
 # and extract specific fields from a CV file, returning them in a
 # structured JSON format.
@@ -49,6 +64,11 @@ RULES:
 You must return the data in JSON format.
 """
 
+# All CV extraction requests start with the same system prompt. Sending
+# them with the same cache key routes them to the same OpenAI prompt
+# cache, so the shared prefix is billed and processed as cached input.
+OPENAI_PROMPT_CACHE_KEY = 'hr_recruitment_openai_cv_extraction'
+
 
 class HrApplicant(models.Model):
     """
@@ -190,17 +210,16 @@ class HrApplicant(models.Model):
     # --- REFACTORED: Core logic split into reusable @api.model methods ---
 
     @api.model
-    def _openai_get_client(self, company_id=None):
+    def _openai_get_config(self, company_id=None):
         """
-        Reusable helper to get configuration and the OpenAI client.
-        This can be called by other models.
+        Reusable helper to get and validate the OpenAI configuration.
 
         Args:
             company_id (int, optional): The ID of the company to get settings from.
                                         If None, falls back to self.env.company.
 
         Returns:
-            (openai.OpenAI, str): A tuple of the (client, model_name).
+            (str, str): A tuple of the (api_key, model_name).
         """
         # In a @api.model method, self is the model/environment
         if company_id:
@@ -217,38 +236,54 @@ class HrApplicant(models.Model):
             raise UserError(_("OpenAI API Key is not set in HR Settings (or is invalid after stripping whitespace)."))
         if not model_name:
             raise UserError(_("OpenAI Model is not set in HR Settings (or is invalid after stripping whitespace)."))
-        
-        return openai.OpenAI(api_key=api_key), model_name
+
+        return api_key, model_name
 
     @api.model
-    def _openai_call_for_cv(self, attachment):
+    def _openai_get_client(self, company_id=None):
         """
-        Reusable method to call the OpenAI API for a single CV attachment.
-        This is a @api.model method and can be called from any model via
-        self.env['hr.applicant']._openai_call_for_cv(att)
+        Reusable helper to get configuration and the OpenAI client.
+        This can be called by other models.
+
+        Args:
+            company_id (int, optional): The ID of the company to get settings from.
+                                        If None, falls back to self.env.company.
+
+        Returns:
+            (openai.OpenAI, str): A tuple of the (client, model_name).
+        """
+        api_key, model_name = self._openai_get_config(company_id)
+        return _openai().OpenAI(api_key=api_key), model_name
+
+    @api.model
+    def _openai_prepare_cv_request(self, attachment):
+        """
+        Reusable method to build the OpenAI request for a single CV
+        attachment, without sending it. Callers can then send it with a
+        sync or an async client.
 
         Args:
             attachment (ir.attachment): The attachment record to process.
 
         Returns:
-            str: The raw text response from the OpenAI API.
+            (str, dict): A tuple of the (api_key, request) where `request`
+            holds the keyword arguments for `client.responses.create()`.
         """
-        # 1. Get client and config
+        # 1. Get config
         # Get company from attachment first, or fall back to env company
         company = attachment.company_id or self.env.company
-        client, model_name = self._openai_get_client(company.id)
+        api_key, model_name = self._openai_get_config(company.id)
 
         # 2. Validate attachment
         if not attachment:
             raise UserError(_("No attachment provided."))
-        if not attachment.datas:
+        if not attachment.file_size:
             raise UserError(_("Attached CV is empty: %s", attachment.name))
 
-        _logger.info("Starting OpenAI call for attachment: %s", attachment.name)
-
-        # 3. Prepare data and client
-        # We send the raw base64 data directly from Odoo
-        base64_string = attachment.datas.decode('utf-8')
+        # 3. Prepare data
+        # Scanned PDFs are downsampled first (if pikepdf is installed).
+        cv_data = compress_pdf(attachment.raw, attachment.mimetype)
+        base64_string = base64.b64encode(cv_data).decode('utf-8')
         file_data_uri = f"data:{attachment.mimetype};base64,{base64_string}"
 
         # 4. Build the input payload
@@ -264,29 +299,55 @@ class HrApplicant(models.Model):
             },
         ]
 
-        # 5. Configure and call the OpenAI API using client.responses.create()
+        request = {
+            'model': model_name,
+            'input': [
+                {
+                    "role": "system",
+                    "content": OPENAI_CV_EXTRACTION_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": user_content
+                }
+            ],
+            'temperature': 0, # Use 0 for deterministic JSON output
+            'prompt_cache_key': OPENAI_PROMPT_CACHE_KEY,
+        }
+        return api_key, request
+
+    @api.model
+    def _openai_call_for_cv(self, attachment):
+        """
+        Reusable method to call the OpenAI API for a single CV attachment.
+        This is a @api.model method and can be called from any model via
+        self.env['hr.applicant']._openai_call_for_cv(att)
+
+        Args:
+            attachment (ir.attachment): The attachment record to process.
+
+        Returns:
+            str: The raw text response from the OpenAI API.
+        """
+        api_key, request = self._openai_prepare_cv_request(attachment)
+        client = _openai().OpenAI(api_key=api_key)
+
+        _logger.info("Starting OpenAI call for attachment: %s", attachment.name)
+
+        # Call the OpenAI API using client.responses.create()
         try:
-            _logger.info("Calling OpenAI model '%s' for attachment %s using client.responses.create", model_name, attachment.name)
-
-            response = client.responses.create(
-                model=model_name,
-                input=[
-                    {
-                        "role": "system",
-                        "content": OPENAI_CV_EXTRACTION_PROMPT
-                    },
-                    {
-                        "role": "user",
-                        "content": user_content
-                    }
-                ],
-                temperature=0, # Use 0 for deterministic JSON output
-            )
-            
+            _logger.info("Calling OpenAI model '%s' for attachment %s using client.responses.create", request['model'], attachment.name)
+
+            response = call_with_retry(client.responses.create, **request)
+
             # As per docs, output is in response.output_text
             response_text = response.output_text
 
         except Exception as e:
+            if is_rate_limit_error(e):
+                # Still rate limited after the retries: re-raise as is so
+                # callers (e.g. queue jobs) can reschedule the work.
+                raise
             _logger.error("OpenAI API call failed: %s", str(e), exc_info=True)
             raise UserError(_("OpenAI API call failed: %s", str(e)))
 
@@ -363,18 +424,11 @@ class HrApplicant(models.Model):
             str: A status message for the operation.
         """
         self.ensure_one()
-        skill_status_message = _('Successfully extracted data.')
-        openai_skills_list = []
 
         # --- Transaction Step 1: Process Simple Data ---
         try:
             with self.env.cr.savepoint():
                 self._write_extracted_data(extracted_data)
-                
-                # Check for skills to process
-                if (extracted_data.get('skills') and
-                        self.env['ir.module.module']._get('hr_recruitment_skills').state == 'installed'):
-                    openai_skills_list = extracted_data.get('skills')
         except Exception as e_simple:
             _logger.error(
                 "Failed to write simple data for Applicant %s: %s.",
@@ -383,8 +437,29 @@ class HrApplicant(models.Model):
             # Re-raise to stop processing; the caller will handle the rollback
             raise UserError(_("Failed to write simple data: %s") % str(e_simple))
 
-
         # --- Transaction Step 2: Process Skills ---
+        return self._process_extracted_skills(extracted_data)
+
+    def _process_extracted_skills(self, extracted_data):
+        """
+        Links the extracted skills to `self` (an hr.applicant record), in
+        their own savepoint: if this fails, the simple data is kept.
+        Used alone for applicants created with the simple data already
+        in their `create()` values.
+
+        Args:
+            extracted_data (dict): The parsed JSON data from OpenAI.
+
+        Returns:
+            str: A status message for the operation.
+        """
+        self.ensure_one()
+        skill_status_message = _('Successfully extracted data.')
+        openai_skills_list = []
+        if (extracted_data.get('skills') and
+                self.env['ir.module.module']._get('hr_recruitment_skills').state == 'installed'):
+            openai_skills_list = extracted_data.get('skills')
+
         if openai_skills_list:
             try:
                 with self.env.cr.savepoint():
@@ -434,11 +509,12 @@ class HrApplicant(models.Model):
                         response_text,
                         record_id=f"applicant_{applicant.id}"
                     )
-                    _logger.info(
-                        "Parsed Data for Applicant %s: \n%s",
-                        applicant.id,
-                        json.dumps(extracted_data, indent=2)
-                    )
+                    if _logger.isEnabledFor(logging.INFO):
+                        _logger.info(
+                            "Parsed Data for Applicant %s: \n%s",
+                            applicant.id,
+                            json.dumps(extracted_data, indent=2)
+                        )
 
                     # 4. Write all data (Reusable INSTANCE method)
                     skill_status_message = applicant._process_extracted_cv_data(extracted_data)
@@ -490,20 +566,52 @@ class HrApplicant(models.Model):
             _logger.warning("No data found to write for applicant %s.", self.id)
             return
 
-        write_vals = {}
+        write_vals = self._prepare_extracted_data_vals(data)
+        # Resolved last, in the savepoint of the write: a failed write
+        # leaves no orphan degree behind.
+        self._add_degree_vals([write_vals], [data.get('degree')])
 
         if data.get('name'):
-            write_vals['partner_name'] = data['name']
             # Also set the main 'name' if it's the default
             applicant_name = self.name or ''
             if not self.name or applicant_name.endswith("'s Application"):
                  write_vals['name'] = _("%s's Application") % data['name']
 
+        if write_vals:
+            if _logger.isEnabledFor(logging.INFO):
+                _logger.info(
+                    "Writing data for Applicant %s: \n%s",
+                    self.id,
+                    json.dumps(write_vals, indent=2)
+                )
+            self.write(write_vals)
+        else:
+            _logger.info("No new simple data to write for applicant %s.", self.id)
+
+    @api.model
+    def _prepare_extracted_data_vals(self, data):
+        """
+        Returns the values of the simple fields (partner name, email,
+        phone, LinkedIn) extracted from the JSON data. Used to write an
+        existing applicant, or directly in the `create()` values of new
+        ones. The degree is not resolved here: see `_add_degree_vals`.
+
+        Args:
+            data (dict): The parsed JSON data from OpenAI.
+
+        Returns:
+            dict: The field values found in the data.
+        """
+        vals = {}
+
+        if data.get('name'):
+            vals['partner_name'] = data['name']
+
         if data.get('email'):
-            write_vals['email_from'] = data['email']
+            vals['email_from'] = data['email']
 
         if data.get('phone'):
-            write_vals['partner_phone'] = data['phone']
+            vals['partner_phone'] = data['phone']
 
         if data.get('linkedin'):
             linkedin_url = data['linkedin']
@@ -511,40 +619,46 @@ class HrApplicant(models.Model):
             # This makes the import robust against markdown in the AI's response
             match = re.search(r'(https?://[^\s)]+)', linkedin_url)
             if match:
-                write_vals['linkedin_profile'] = match.group(1)
+                vals['linkedin_profile'] = match.group(1)
             else:
                 # Fallback if no URL found but field has non-URL text
-                write_vals['linkedin_profile'] = linkedin_url
+                vals['linkedin_profile'] = linkedin_url
 
-        # Write to Odoo's standard 'type_id' (Degree) field
-        if data.get('degree'):
-            degree_name = data.get('degree')
-            if degree_name:
-                degree_env = self.env['hr.recruitment.degree']
-                # Find existing degree (case-insensitive)
-                degree_rec = degree_env.search([('name', '=ilike', degree_name)], limit=1)
-                if not degree_rec:
-                    _logger.info("Creating new degree: %s", degree_name)
-                    try:
-                        # Create if not found, but don't fail the whole
-                        # transaction if this one create fails.
-                        degree_rec = degree_env.create({'name': degree_name})
-                    except Exception as e:
-                        _logger.error("Failed to create degree '%s': %s", degree_name, str(e))
-                        pass  # Log and continue
-
-                if degree_rec:
-                    write_vals['type_id'] = degree_rec.id
+        return vals
 
-        if write_vals:
-            _logger.info(
-                "Writing data for Applicant %s: \n%s",
-                self.id,
-                json.dumps(write_vals, indent=2)
+    @api.model
+    def _add_degree_vals(self, vals_list, degree_names):
+        """
+        Sets Odoo's standard 'type_id' (Degree) field in the applicant
+        values from the extracted degree names. The existing degrees are
+        found (case-insensitive) with one search, and the missing ones
+        created with one create(). Meant to be called once the values are
+        otherwise complete, inside the savepoint of the applicant write or
+        create: if it fails, the new degrees are rolled back with it.
+
+        Args:
+            vals_list (list): The applicant values, updated in place.
+            degree_names (list): The degree name of each values, or None.
+        """
+        names = {name.lower(): name for name in degree_names if name}
+        if not names:
+            return
+        degree_env = self.env['hr.recruitment.degree']
+        degree_ids = {
+            degree.name.lower(): degree.id
+            for degree in degree_env.search(
+                expression.OR([[('name', '=ilike', name)] for name in names.values()])
             )
-            self.write(write_vals)
-        else:
-            _logger.info("No new simple data to write for applicant %s.", self.id)
+        }
+        missing_names = [name for key, name in names.items() if key not in degree_ids]
+        if missing_names:
+            _logger.info("Creating new degrees: %s", ", ".join(missing_names))
+            for degree in degree_env.create([{'name': name} for name in missing_names]):
+                degree_ids[degree.name.lower()] = degree.id
+
+        for vals, degree_name in zip(vals_list, degree_names):
+            if degree_name:
+                vals['type_id'] = degree_ids[degree_name.lower()]
 
     def _get_or_create_default_skill_level(self):
         """
@@ -10,7 +10,7 @@ from odoo.tests.common import TransactionCase
 from odoo.exceptions import UserError
 
 # Import the prompt constant from the model file
-from odoo.addons.hr_recruitment_openai.models.hr_applicant import OPENAI_CV_EXTRACTION_PROMPT
+from odoo.addons.hr_recruitment_openai.models.hr_applicant import OPENAI_CV_EXTRACTION_PROMPT, OPENAI_PROMPT_CACHE_KEY
 
 # Sample successful response from OpenAI
 # This simulates the JSON data we expect the API to return.
@@ -228,7 +228,7 @@ class TestHrApplicantOpenAI(TransactionCase):
         mock_app_skill_search = MagicMock(return_value=applicant_skill_model.browse([]))
 
         # 3. Patch the `openai.OpenAI` client and all relevant search methods
-        with patch('odoo.addons.hr_recruitment_openai.models.hr_applicant.openai.OpenAI', return_value=mock_openai_client) as mock_openai_constructor, \
+        with patch('openai.OpenAI', return_value=mock_openai_client) as mock_openai_constructor, \
              patch.object(type(degree_model), 'search', side_effect=mock_degree_search) as mock_degree_search_patch, \
              patch.object(type(skill_type_model), 'search', side_effect=mock_skill_type_search), \
              patch.object(type(skill_level_model), 'search', side_effect=mock_skill_level_search), \
@@ -248,6 +248,7 @@ class TestHrApplicantOpenAI(TransactionCase):
             # Check system prompt
             self.assertEqual(call_args['input'][0]['role'], 'system')
             self.assertEqual(call_args['input'][0]['content'], OPENAI_CV_EXTRACTION_PROMPT)
+            self.assertEqual(call_args['prompt_cache_key'], OPENAI_PROMPT_CACHE_KEY)
             
             # Check user content (file and text)
             user_content = call_args['input'][1]['content']
@@ -269,7 +270,7 @@ class TestHrApplicantOpenAI(TransactionCase):
 
             # 8. Check created degree
             mock_degree_search_patch.assert_called_with(
-                [('name', '=ilike', "Bachelor's Degree in Computer Science")], limit=1
+                [('name', '=ilike', "Bachelor's Degree in Computer Science")]
             )
             self.assertEqual(self.applicant.type_id.id, real_degree.id)
             
@@ -300,7 +301,7 @@ class TestHrApplicantOpenAI(TransactionCase):
         )
 
         # 2. Patch the client
-        with patch('odoo.addons.hr_recruitment_openai.models.hr_applicant.openai.OpenAI', return_value=mock_openai_client):
+        with patch('openai.OpenAI', return_value=mock_openai_client):
             
             # 3. Run the action
             self.applicant.action_extract_with_openai()
@@ -322,7 +323,7 @@ class TestHrApplicantOpenAI(TransactionCase):
         mock_openai_client.responses.create.return_value = mock_api_response
         
         # 2. Patch the client
-        with patch('odoo.addons.hr_recruitment_openai.models.hr_applicant.openai.OpenAI', return_value=mock_openai_client):
+        with patch('openai.OpenAI', return_value=mock_openai_client):
 
             # 3. Run the action
             self.applicant.action_extract_with_openai()
@@ -379,3 +380,29 @@ class TestHrApplicantOpenAI(TransactionCase):
         self.applicant.message_main_attachment_id = False
         self.assertFalse(self.applicant.can_extract_with_openai)
 
+
+    def test_06_rate_limit_retry(self):
+        """
+        Test that a rate-limited API call is retried after the delay
+        suggested by the server.
+        """
+        mock_api_response = MagicMock()
+        mock_api_response.output_text = json.dumps({"name": "John Doe"})
+
+        rate_limit_error = openai.RateLimitError(
+            "Rate limit reached",
+            response=MagicMock(status_code=429, headers={'retry-after': '2'}),
+            body=None,
+        )
+        mock_openai_client = MagicMock()
+        mock_openai_client.responses.create.side_effect = [rate_limit_error, mock_api_response]
+
+        with patch('openai.OpenAI', return_value=mock_openai_client), \
+             patch('odoo.addons.hr_recruitment_llm_utils.utils.llm_retry.time.sleep') as mock_sleep:
+
+            self.applicant.action_extract_with_openai()
+
+            mock_sleep.assert_called_once_with(2.0)
+            self.assertEqual(mock_openai_client.responses.create.call_count, 2)
+            self.assertEqual(self.applicant.openai_extract_state, 'done')
+            self.assertEqual(self.applicant.partner_name, 'John Doe')